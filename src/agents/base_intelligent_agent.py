@@ -6,12 +6,41 @@ Provides Claude integration and common functionality for independent agents
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import logging
+import hashlib
 import json
+import math
+import queue
+import re
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict, deque
+from functools import lru_cache
+from itertools import islice
 from datetime import datetime
-from typing import Optional, Dict, Any, List
-import anthropic
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+# Fast JSON encoding for request bodies when orjson is installed
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    # Fallback to the standard library, matching orjson's compact bytes output
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    _loads = json.loads
+
+# MurmurHash3 for Bloom filter probes when available, blake2b otherwise
+try:
+    import mmh3
+except ImportError:
+    mmh3 = None
 
 # Import environment setup
 try:
@@ -25,18 +54,219 @@ except ImportError:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Static parts of the Claude prompts, kept byte-identical so the cached prefix stays warm
+_PROMPT_RULES = """You communicate with other AI agents in the AI Manager system (ai-manager, maya-agent, blaze-agent, jugad-agent).
+Respond as one AI agent to another - be direct and helpful, in one or two sentences."""
+# Sentence end = punctuation plus whitespace; a streamed chunk may stop mid-number ("version 2.")
+_SENTENCE_END_RE = re.compile(r'[.!?]\s')
+# Bare acknowledgements that need no reply at all, after any leading @mentions; a
+# "status update" only counts with nothing after it, so real reports still get answered
+_ACK_WORDS = r'(?:ok(?:ay)?|ack(?:nowledged)?|noted|received|got it|thanks?(?: you)?|thx|roger|copy that|will do|sounds good|confirmed)'
+_ACK_RE = re.compile(
+    rf'\s*(?:@[\w-]+[\s,:]*)*(?:{_ACK_WORDS}(?:[\s,.!-]+{_ACK_WORDS})*|status update)[\s.!]*',
+    re.IGNORECASE
+)
+# Claude often wraps a JSON reply in a ```json fence; the array is inside
+_CODE_FENCE_RE = re.compile(r'\s*```(?:json)?\s*(.*?)\s*```\s*', re.DOTALL | re.IGNORECASE)
+_BATCH_REPLY_INSTRUCTIONS = (
+    "Respond to each of the following messages from other AI agents. "
+    "Return only a JSON array of strings, one reply per message, in the same order.\n\n"
+)
+
+# Repository root, so default log/history paths don't depend on the working directory
+_REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Well-known files looked for at a project root
+_PROJECT_FILES = ("README.md", "package.json", "pyproject.toml", "requirements.txt", "setup.py")
+
+# (epoch second, ISO string) - timestamps only need second resolution
+_iso_cache = (0, "")
+
+def _now_iso() -> str:
+    """Current local time as an ISO string, formatted at most once per second"""
+    global _iso_cache
+    second = int(time.time())
+    cached_second, iso = _iso_cache
+    if cached_second != second:
+        iso = datetime.fromtimestamp(second).isoformat()
+        _iso_cache = (second, iso)
+    return iso
+
+@lru_cache(maxsize=64)
+def _read_text_cached(path: str, mtime_ns: int, size: int) -> str:
+    """File contents, memoized on (path, mtime, size) so edits invalidate the entry"""
+    return Path(path).read_text()
+
+@lru_cache(maxsize=64)
+def _load_json_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """Parsed JSON file, memoized like _read_text_cached - callers must not mutate it"""
+    # Parse straight from bytes; orjson skips building an intermediate str
+    return _loads(Path(path).read_bytes())
+
+def _read_text(path: Path) -> str:
+    """Read a text file, reusing the previous read while the file is unchanged"""
+    stat = path.stat()
+    return _read_text_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+def _read_json(path: Path) -> Any:
+    """Parse a JSON file, reusing the previous parse while the file is unchanged"""
+    stat = path.stat()
+    return _load_json_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+def _count_proc_matching(pattern: re.Pattern) -> int:
+    """Count running processes whose command line matches pattern, scanning /proc instead of forking ps"""
+    count = 0
+    try:
+        entries = os.scandir('/proc')
+    except OSError:
+        return 0
+    with entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry.name}/cmdline', 'rb') as f:
+                    cmdline = f.read()
+            except OSError:
+                # Process exited or is not readable
+                continue
+            # Arguments are NUL-separated; join them with spaces like ps does
+            if pattern.search(cmdline.replace(b'\0', b' ')):
+                count += 1
+    return count
+
+class BloomFilter:
+    """Fixed-size Bloom filter for message ids - O(1) add/lookup, no false negatives"""
+    
+    __slots__ = ("capacity", "error_rate", "num_bits", "num_hashes", "_bits", "_count", "_lock")
+    
+    def __init__(self, capacity: int = 10_000, error_rate: float = 1e-4):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # Optimal bit count and probe count for the target false-positive rate
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+        self._lock = threading.Lock()
+    
+    def _probes(self, item: str) -> List[int]:
+        """Bit positions for an item via double hashing of one 128-bit hash"""
+        if mmh3 is not None:
+            h1, h2 = mmh3.hash64(item, signed=False)
+        else:
+            digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+            h1 = int.from_bytes(digest[:8], "little")
+            h2 = int.from_bytes(digest[8:], "little")
+        h2 |= 1  # odd step so probes never collapse onto one bit
+        num_bits = self.num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+    
+    def add(self, item: str) -> None:
+        """Add an item to the filter"""
+        probes = self._probes(item)
+        with self._lock:
+            for bit in probes:
+                self._bits[bit >> 3] |= 1 << (bit & 7)
+            self._count += 1
+    
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[bit >> 3] & (1 << (bit & 7)) for bit in self._probes(item))
+    
+    def __len__(self) -> int:
+        """Number of items added (not distinct items)"""
+        return self._count
+    
+    def clear(self) -> None:
+        """Forget every item"""
+        with self._lock:
+            self._bits = bytearray(len(self._bits))
+            self._count = 0
+
 class BaseIntelligentAgent:
     """Base class for intelligent agents with Claude integration"""
     
+    _FALLBACK_TMPL = "Hello {from_agent}! I'm {agent_name}. I received your message: '{snippet}...' but I'm currently operating in fallback mode."
+    
+    # Fixed attribute layout; subclasses that add __slots__ of their own drop the per-instance __dict__
+    __slots__ = (
+        # Identity and API connection
+        "agent_id", "agent_name", "description", "capabilities", "api_base_url", "status",
+        "_urls", "http", "_registration_body", "model_info",
+        # Claude client and prompts
+        "anthropic_api_key", "claude_client", "_system_prompt_cached", "_claude_system_block",
+        "claude_reply_max_tokens", "claude_reply_max_sentences", "claude_reply_max_chars",
+        # Conversation history
+        "max_history", "_hist_ts", "_hist_from", "_hist_msg", "_history_lock",
+        "history_db_path", "_hist_db",
+        # Tasks and stats
+        "max_task_queue", "task_queue", "current_task", "performance_stats", "_uptime_start_mono",
+        # Rate limiting
+        "claude_rate_limit", "_claude_req_times", "_claude_rate_lock",
+        # Message deduplication
+        "max_processed_messages", "processed_messages", "processed_messages_max_age",
+        "_processed_messages_reset_at",
+        # Message Batches API
+        "claude_batch_size", "claude_batch_max_age",
+        "_pending_claude_requests", "_pending_claude_since", "_claude_batches", "_claude_batch_lock",
+        "claude_batch_poll_interval", "_claude_batch_next_check",
+        # Message workers and stream
+        "message_workers", "claude_reply_batch_size", "_message_queue", "_inflight_messages",
+        "_worker_threads", "message_stream_max_backoff", "_stream_thread", "_stream_connected",
+        "_last_message_id",
+        # Heartbeat thread and outbox
+        "_heartbeat_thread", "_heartbeat_stop",
+        "outbox_flush_interval", "outbox_max_batch_size", "_outbox", "_outbox_timer", "_outbox_lock",
+        "outbox_retry_delay", "outbox_max_retries", "_outbox_failures",
+        # Reply cache
+        "response_cache_size", "response_cache_ttl", "_response_cache", "_response_cache_lock",
+        # Project file listings
+        "_project_listing_cache",
+    )
+    
     def __init__(self, agent_id: str, agent_name: str, description: str, 
-                 capabilities: List[str], api_base_url: str = "http://localhost:5000"):
-        self.agent_id = agent_id
-        self.agent_name = agent_name
+                 capabilities: List[str], api_base_url: str = "http://localhost:5000",
+                 history_db_path: Optional[str] = None):
+        self.agent_id = sys.intern(agent_id)
+        self.agent_name = sys.intern(agent_name)
         self.description = description
         self.capabilities = capabilities
         self.api_base_url = api_base_url
         self.status = "offline"
         
+        # API endpoints used on every loop, formatted once
+        agent_url = f"{api_base_url}/api/agents/{agent_id}"
+        self._urls = {
+            "models": f"{api_base_url}/api/models",
+            "register": f"{api_base_url}/api/agents/register",
+            "heartbeat": f"{agent_url}/heartbeat",
+            "state": f"{agent_url}/state",
+            "activity": f"{agent_url}/activity",
+            "pulse": f"{api_base_url}/api/pulse",
+            "send": f"{api_base_url}/api/communications/send",
+            "send_batch": f"{api_base_url}/api/communications/send_batch",
+            "messages": f"{agent_url}/messages",
+            "stream": f"{agent_url}/stream"
+        }
+        
+        # Persistent HTTP session so API calls reuse pooled keep-alive connections
+        self.http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=20,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        )
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        self.http.headers.update({
+            "User-Agent": f"ai-manager-agent/2.0.0 ({self.agent_id})",
+            "Content-Type": "application/json",
+            "X-Agent-Id": self.agent_id
+        })
+        
         # Claude integration - REQUIRED, NO FALLBACKS
         self.anthropic_api_key = os.environ.get('ANTHROPIC_API_KEY')
         if not self.anthropic_api_key:
@@ -44,43 +274,135 @@ class BaseIntelligentAgent:
             self.claude_client = None
         else:
             try:
-                self.claude_client = anthropic.Anthropic(api_key=self.anthropic_api_key)
+                # Imported here so agents without a key skip loading the SDK
+                import anthropic
+                # Bounded timeout and a single retry so a stalled call can't pin a worker for minutes
+                self.claude_client = anthropic.Anthropic(
+                    api_key=self.anthropic_api_key,
+                    timeout=30.0,
+                    max_retries=1
+                )
                 logger.info(f"✅ Claude integration enabled for {self.agent_id}")
             except Exception as e:
                 logger.error(f"❌ Claude client initialization failed: {e}")
                 self.claude_client = None
         
-        # Agent memory and context
-        self.conversation_history = []
-        self.task_queue = []
+        # Agent memory and context - conversation history is kept as parallel
+        # bounded columns (timestamp, sender, message) rather than a list of dicts
+        self.max_history = 256
+        self._hist_ts = deque(maxlen=self.max_history)
+        self._hist_from = deque(maxlen=self.max_history)
+        self._hist_msg = deque(maxlen=self.max_history)
+        self._history_lock = threading.Lock()
+        
+        # Full history is persisted to SQLite; the deques above keep the recent tail in memory
+        self.history_db_path = history_db_path or str(_REPO_ROOT / "logs" / f"{agent_id}_history.db")
+        self._hist_db = self._open_history_db()
+        self.max_task_queue = 10_000
+        self.task_queue = deque(maxlen=self.max_task_queue)  # oldest tasks drop when full
         self.current_task = None
         self.performance_stats = {
             "tasks_completed": 0,
             "messages_processed": 0,
-            "uptime_start": datetime.now(),
+            "uptime_start": datetime.now(),  # wall-clock start, for reports only
             "last_activity": None
         }
+        self._uptime_start_mono = time.monotonic()
         
         # Rate limiting for Claude API (very high limit for autonomous management)
         self.claude_rate_limit = {
-            "requests": [],
             "max_requests": 1000,  # Very high limit to prevent fallback
             "window_minutes": 1
         }
+        # Monotonic timestamps of requests inside the sliding window, oldest first
+        self._claude_req_times = deque(maxlen=self.claude_rate_limit["max_requests"])
+        self._claude_rate_lock = threading.Lock()
+        
+        # Message deduplication system - a Bloom filter, so lookups never need trimming
+        self.max_processed_messages = 10_000
+        self.processed_messages = BloomFilter(capacity=self.max_processed_messages, error_rate=1e-4)
+        # Reset on a fixed age rather than checking saturation on every lookup
+        self.processed_messages_max_age = 600  # seconds
+        self._processed_messages_reset_at = time.monotonic() + self.processed_messages_max_age
+        
+        # Messages sent with "defer": true are answered through the Message Batches API
+        self.claude_batch_size = 20
+        self.claude_batch_max_age = 10  # seconds before a partial batch is flushed
+        self._pending_claude_requests = []  # (custom_id, from_agent, request params)
+        self._pending_claude_since = 0.0
+        self._claude_batches = {}  # batch id -> {custom_id: from_agent}
+        self.claude_batch_poll_interval = 30  # seconds between status checks of a submitted batch
+        self._claude_batch_next_check = {}  # batch id -> monotonic time of the next status check
+        self._claude_batch_lock = threading.Lock()
+        
+        # Worker threads process messages so Claude calls overlap heartbeats and polling
+        self.message_workers = 4
+        self.claude_reply_batch_size = 16  # messages answered by one Claude call
+        self._message_queue = queue.Queue(maxsize=32)
+        self._inflight_messages = set()
+        self._worker_threads = []
+        
+        # Server-Sent Events stream that pushes messages; polling is the fallback
+        self.message_stream_max_backoff = 60
+        self._stream_thread = None
+        self._stream_connected = threading.Event()
+        self._last_message_id = None  # newest message seen, so polls only fetch newer ones
+        
+        # Optional background heartbeat so slow loop work never delays it
+        self._heartbeat_thread = None
+        self._heartbeat_stop = threading.Event()
+        
+        # Outgoing messages are buffered briefly and posted together
+        self.outbox_flush_interval = 0.01  # seconds
+        self.outbox_max_batch_size = 20
+        self._outbox = []
+        self._outbox_timer = None
+        self._outbox_lock = threading.Lock()
+        # Posts that fail to reach the API server are retried a few times, then dropped with an error
+        self.outbox_retry_delay = 2  # seconds, multiplied by the consecutive failure count
+        self.outbox_max_retries = 3
+        self._outbox_failures = 0
+        
+        # LRU cache of Claude replies keyed on (from_agent, normalized message)
+        self.response_cache_size = 512
+        self.response_cache_ttl = 24 * 3600  # seconds
+        self._response_cache = OrderedDict()
+        self._response_cache_lock = threading.Lock()
         
-        # Message deduplication system
-        self.processed_messages = set()
-        self.max_processed_messages = 100  # Keep last 100 message IDs
+        # Project directory listings keyed on path, reused until a directory mtime changes
+        self._project_listing_cache = {}
+        
+        # Replies are streamed and cut off once they reach this many sentences
+        self.claude_reply_max_tokens = 120
+        self.claude_reply_max_sentences = 2
+        self.claude_reply_max_chars = 400
+        
+        # Static system prompt, sent with a cache breakpoint on every Claude call
+        self._system_prompt_cached = self._build_system_prompt()
+        self._claude_system_block = [{
+            "type": "text",
+            "text": self._system_prompt_cached,
+            "cache_control": {"type": "ephemeral"}
+        }]
         
         # Model information
         self.model_info = self._get_model_info()
+        
+        # Registration payload never changes, so serialize it once
+        self._registration_body = _dumps({
+            "agent_id": self.agent_id,
+            "agent_name": self.agent_name,
+            "description": self.description,
+            "capabilities": self.capabilities,
+            "model_info": self.model_info
+        })
     
     def _get_model_info(self) -> dict:
         """Get model information for this agent"""
         if self.claude_client:
             # Get the best available model from API server
             try:
-                response = requests.get(f"{self.api_base_url}/api/models", timeout=5)
+                response = self.http.get(self._urls["models"], timeout=5)
                 if response.status_code == 200:
                     models_data = response.json()
                     if models_data.get("models"):
@@ -101,8 +423,8 @@ class BaseIntelligentAgent:
             # Fallback to default model
             return {
                 "provider": "Anthropic",
-                "model": "claude-3-haiku-20240307",
-                "display_name": "Claude Haiku 3",
+                "model": "claude-3-5-haiku-20241022",
+                "display_name": "Claude Haiku 3.5",
                 "status": "active",
                 "api_key_present": bool(self.anthropic_api_key),
                 "intelligence_level": "claude_powered"
@@ -118,7 +440,7 @@ class BaseIntelligentAgent:
     
     def get_current_model(self) -> str:
         """Get the current best model ID for API calls"""
-        return self.model_info.get("model", "claude-3-haiku-20240307")
+        return self.model_info.get("model", "claude-3-5-haiku-20241022")
     
     def check_claude_available(self) -> bool:
         """Check if Claude is available for processing"""
@@ -134,27 +456,9 @@ class BaseIntelligentAgent:
         
         for attempt in range(max_retries):
             try:
-                agent_info = {
-                    "name": self.agent_name,
-                    "description": self.description,
-                    "capabilities": self.capabilities,
-                    "version": "2.0.0",
-                    "created_at": datetime.now().isoformat(),
-                    "intelligence_level": self.model_info["intelligence_level"],
-                    "model_info": self.model_info
-                }
-                
-                registration_data = {
-                    "agent_id": self.agent_id,
-                    "agent_name": self.agent_name,
-                    "description": self.description,
-                    "capabilities": self.capabilities,
-                    "model_info": self.model_info
-                }
-                
-                response = requests.post(
-                    f"{self.api_base_url}/api/agents/register",
-                    json=registration_data,
+                response = self.http.post(
+                    self._urls["register"],
+                    data=self._registration_body,
                     timeout=10
                 )
                 
@@ -181,13 +485,13 @@ class BaseIntelligentAgent:
     def send_heartbeat(self) -> bool:
         """Send heartbeat to maintain registration"""
         try:
-            response = requests.post(
-                f"{self.api_base_url}/api/agents/{self.agent_id}/heartbeat",
+            response = self.http.post(
+                self._urls["heartbeat"],
                 timeout=5
             )
             
             if response.status_code == 200:
-                logger.debug(f"💓 Heartbeat sent for {self.agent_id}")
+                logger.debug("💓 Heartbeat sent for %s", self.agent_id)
                 return True
             else:
                 logger.warning(f"⚠️ Heartbeat failed: {response.status_code}")
@@ -197,16 +501,76 @@ class BaseIntelligentAgent:
             logger.error(f"❌ Heartbeat error: {e}")
             return False
     
+    def start_heartbeat(self, interval: float = 30) -> None:
+        """Send heartbeats from a daemon thread every interval seconds until close()"""
+        if self._heartbeat_thread is not None and self._heartbeat_thread.is_alive():
+            return
+        
+        def heartbeat_loop():
+            while True:
+                try:
+                    self._heartbeat_tick()
+                except Exception as e:
+                    logger.error(f"❌ Heartbeat error: {e}")
+                if self._heartbeat_stop.wait(interval):
+                    return
+        
+        self._heartbeat_stop.clear()
+        self._heartbeat_thread = threading.Thread(
+            target=heartbeat_loop,
+            name=f"{self.agent_id}-heartbeat",
+            daemon=True
+        )
+        self._heartbeat_thread.start()
+    
+    def _heartbeat_tick(self) -> None:
+        """Work done on each background heartbeat; agents may fold their status pulse in here"""
+        self.send_heartbeat()
+    
+    def send_state(self, pulse_message: str = "", pulse_status: str = "online",
+                   activity_status: str = "", activity_details: str = "") -> bool:
+        """Send heartbeat, pulse and activity status in a single request"""
+        try:
+            response = self.http.post(
+                self._urls["state"],
+                data=_dumps({
+                    "pulse_message": pulse_message,
+                    "pulse_status": pulse_status,
+                    "activity_status": activity_status,
+                    "activity_details": activity_details
+                }),
+                timeout=5
+            )
+            
+            if response.status_code == 200:
+                logger.debug("💓 State sent for %s", self.agent_id)
+                return True
+            elif response.status_code == 404:
+                # Unknown agent or an API server without /state - fall back to the separate calls
+                sent = self.send_heartbeat()
+                if pulse_message:
+                    sent = self.send_pulse_update(pulse_message, pulse_status) and sent
+                if activity_status:
+                    self.update_activity_status(activity_status, activity_details)
+                return sent
+            else:
+                logger.warning(f"⚠️ State update failed: {response.status_code}")
+                return False
+                
+        except Exception as e:
+            logger.error(f"❌ State update error: {e}")
+            return False
+    
     def update_activity_status(self, status: str, details: str = ""):
         """Update agent activity status"""
         try:
-            response = requests.post(
-                f"{self.api_base_url}/api/agents/{self.agent_id}/activity",
-                json={"status": status, "details": details},
+            response = self.http.post(
+                self._urls["activity"],
+                data=_dumps({"status": status, "details": details}),
                 timeout=5
             )
             if response.status_code == 200:
-                logger.debug(f"🔄 Activity status updated: {status}")
+                logger.debug("🔄 Activity status updated: %s", status)
             else:
                 logger.warning(f"⚠️ Activity update failed: {response.status_code}")
         except Exception as e:
@@ -221,14 +585,14 @@ class BaseIntelligentAgent:
                 "status": status
             }
             
-            response = requests.post(
-                f"{self.api_base_url}/api/pulse",
-                json=pulse_data,
+            response = self.http.post(
+                self._urls["pulse"],
+                data=_dumps(pulse_data),
                 timeout=5
             )
             
             if response.status_code == 200:
-                logger.debug(f"💓 Pulse update sent for {self.agent_id}: {message[:30]}...")
+                logger.debug("💓 Pulse update sent for %s: %.30s...", self.agent_id, message)
                 return True
             else:
                 logger.warning(f"⚠️ Pulse update failed: {response.status_code}")
@@ -239,7 +603,100 @@ class BaseIntelligentAgent:
             return False
     
     def send_message(self, target_agent: str, message: str, message_type: str = "agent_message") -> bool:
-        """Send a message to another agent"""
+        """Queue a message to another agent; queued messages are posted together shortly after
+
+        Fire-and-forget: True means the message was queued (or, when this call
+        flushed a full outbox, that the flush succeeded). Delivery happens on a
+        timer thread, which logs failures and retries them before giving up.
+        """
+        with self._outbox_lock:
+            self._outbox.append({"target_agent": target_agent, "message": message})
+            if len(self._outbox) >= self.outbox_max_batch_size:
+                flush_now = True
+            else:
+                flush_now = False
+                if self._outbox_timer is None:
+                    self._start_outbox_timer(self.outbox_flush_interval)
+        
+        if flush_now:
+            return self._flush_outbox()
+        return True
+    
+    def _start_outbox_timer(self, delay: float) -> None:
+        """Arm the outbox flush timer (caller holds the lock); daemon, so it never blocks exit"""
+        self._outbox_timer = threading.Timer(delay, self._flush_outbox)
+        self._outbox_timer.daemon = True
+        self._outbox_timer.start()
+    
+    def _flush_outbox(self, requeue: bool = True) -> bool:
+        """Post every queued outgoing message, requeueing them if the API server can't be reached"""
+        with self._outbox_lock:
+            pending, self._outbox = self._outbox, []
+            if self._outbox_timer is not None:
+                self._outbox_timer.cancel()
+                self._outbox_timer = None
+        
+        if not pending:
+            return True
+        delivered, retry = self._post_outbox(pending)
+        if retry and not requeue:
+            logger.error(f"❌ Dropping {len(retry)} outgoing messages - API server unreachable")
+        elif retry:
+            self._requeue_outbox(retry)
+        else:
+            self._outbox_failures = 0
+        return delivered
+    
+    def _post_outbox(self, pending: List[Dict[str, str]]) -> Tuple[bool, List[Dict[str, str]]]:
+        """Post queued messages, in one request when there are several; returns (all delivered, entries to retry)"""
+        if len(pending) == 1:
+            if self._send_message_now(pending[0]["target_agent"], pending[0]["message"]):
+                return True, []
+            return False, pending
+        
+        try:
+            response = self.http.post(
+                self._urls["send_batch"],
+                data=_dumps({"agent_id": self.agent_id, "messages": pending}),
+                timeout=5
+            )
+            
+            if response.status_code == 200:
+                logger.info(f"📤 Sent {len(pending)} messages in one batch")
+                # Messages the server rejected are logged but not retried
+                failed = [result["error"] for result in _loads(response.content).get("results", []) if "error" in result]
+                for error in failed:
+                    logger.error(f"❌ Failed to send message: {error}")
+                return not failed, []
+            elif response.status_code == 404:
+                # API server without the batch endpoint - send one by one
+                retry = [entry for entry in pending if not self._send_message_now(entry["target_agent"], entry["message"])]
+                return not retry, retry
+            else:
+                logger.error(f"❌ Failed to send message batch: {response.status_code}")
+                return False, pending
+                
+        except Exception as e:
+            logger.error(f"❌ Message batch sending error: {e}")
+            return False, pending
+    
+    def _requeue_outbox(self, retry: List[Dict[str, str]]) -> None:
+        """Put undelivered messages back at the front of the outbox and retry after a delay"""
+        with self._outbox_lock:
+            self._outbox_failures += 1
+            if self._outbox_failures > self.outbox_max_retries:
+                logger.error(f"❌ Dropping {len(retry)} outgoing messages after {self.outbox_max_retries} retries")
+                self._outbox_failures = 0
+                return
+            self._outbox[:0] = retry
+            delay = self.outbox_retry_delay * self._outbox_failures
+            if self._outbox_timer is not None:
+                self._outbox_timer.cancel()
+            self._start_outbox_timer(delay)
+        logger.warning(f"⚠️ Retrying {len(retry)} outgoing messages in {delay}s")
+    
+    def _send_message_now(self, target_agent: str, message: str) -> bool:
+        """Post a single message to another agent immediately"""
         try:
             message_data = {
                 "agent_id": self.agent_id,
@@ -247,9 +704,9 @@ class BaseIntelligentAgent:
                 "message": message
             }
             
-            response = requests.post(
-                f"{self.api_base_url}/api/communications/send",
-                json=message_data,
+            response = self.http.post(
+                self._urls["send"],
+                data=_dumps(message_data),
                 timeout=5
             )
             
@@ -267,67 +724,261 @@ class BaseIntelligentAgent:
     def check_for_messages(self) -> bool:
         """Check for incoming messages with rate limiting"""
         try:
-            response = requests.get(f"{self.api_base_url}/api/agents/{self.agent_id}/messages")
+            # Age out the dedup filter before it saturates; polls only fetch newer messages anyway
+            now = time.monotonic()
+            if now >= self._processed_messages_reset_at:
+                self.processed_messages.clear()
+                self._processed_messages_reset_at = now + self.processed_messages_max_age
+            
+            # Submit queued batch requests and deliver finished batch replies
+            self._maybe_flush_claude_batch()
+            self._collect_claude_batches()
+            
+            # Messages arrive over the stream while it is up; only poll when it is down
+            self._ensure_message_stream()
+            if self._stream_connected.is_set():
+                return True
+            
+            params = {"since": self._last_message_id} if self._last_message_id else None
+            response = self.http.get(self._urls["messages"], params=params, timeout=5)
             if response.status_code == 200:
-                messages = response.json()
-                # Process only the latest message to avoid rate limiting
+                messages = _loads(response.content)
                 if messages:
-                    message = messages[-1]  # Process the LATEST message
-                    message_id = message.get('id', '')
-                    
-                    # Check if we've already processed this message
-                    if message_id in self.processed_messages:
-                        logger.debug(f"📨 Message already processed: {message_id}")
-                        return True
-                    
-                    if self.process_message(message):
-                        # Mark message as processed
-                        self.processed_messages.add(message_id)
-                        logger.info(f"📨 Processed message: {message.get('message', '')[:50]}...")
+                    if self._last_message_id is None:
+                        # First poll after a start: answer only the newest message, not the
+                        # old conversation the server still holds
+                        messages = messages[-1:]
+                    self._last_message_id = messages[-1].get('id') or self._last_message_id
+                
+                # Hand every unprocessed message to the workers, which batch them into Claude calls
+                for message in messages:
+                    self._enqueue_message(message)
                 return True
             return False
         except Exception as e:
             logger.error(f"❌ Error checking messages: {e}")
             return False
     
-    def process_message(self, message: Dict[str, Any]) -> bool:
-        """Process an incoming message with intelligent response"""
-        try:
-            message_text = message.get('message', '')
-            from_agent = message.get('from_agent', 'unknown')
-            message_id = message.get('id', '')
-            
-            # Check if message has already been processed
-            if message_id and self._is_message_processed(message_id):
-                logger.info(f"🚫 Message {message_id[:8]}... already processed - SKIPPING")
-                return False
+    def _ensure_message_stream(self) -> None:
+        """Start the message stream reader thread on first use"""
+        if self._stream_thread is not None:
+            return
+        self._stream_thread = threading.Thread(
+            target=self._message_stream_loop,
+            name=f"{self.agent_id}-stream",
+            daemon=True
+        )
+        self._stream_thread.start()
+    
+    def _message_stream_loop(self) -> None:
+        """Read pushed messages from the API server, reconnecting with backoff"""
+        url = self._urls["stream"]
+        backoff = 1
+        while True:
+            try:
+                # Resume after the newest message already seen so nothing sent while disconnected is lost
+                params = {"since": self._last_message_id} if self._last_message_id else None
+                with self.http.get(url, params=params, stream=True, timeout=(5, 60)) as response:
+                    if response.status_code == 404:
+                        # Older API server without streaming - stay on polling
+                        logger.info(f"📡 Message stream not available for {self.agent_id} - polling instead")
+                        return
+                    if response.status_code == 200:
+                        self._stream_connected.set()
+                        backoff = 1
+                        logger.info(f"📡 Message stream connected for {self.agent_id}")
+                        for line in response.iter_lines(decode_unicode=True):
+                            if line and line.startswith("data: "):
+                                message = _loads(line[6:])
+                                self._last_message_id = message.get('id') or self._last_message_id
+                                self._enqueue_message(message, block=True)
+            except Exception as e:
+                logger.warning(f"⚠️ Message stream error for {self.agent_id}: {e}")
             
-            logger.info(f"📨 Received message from {from_agent}: {message_text[:100]}...")
+            self._stream_connected.clear()
+            time.sleep(backoff)
+            backoff = min(backoff * 2, self.message_stream_max_backoff)
+    
+    def _enqueue_message(self, message: Dict[str, Any], block: bool = False) -> bool:
+        """Queue a message for the worker threads, skipping ones already handled or in flight"""
+        self._ensure_message_workers()
+        
+        message_id = message.get('id', '')
+        
+        # Check if we've already processed this message
+        if message_id in self.processed_messages:
+            logger.debug("📨 Message already processed: %s", message_id)
+            return False
+        if message_id in self._inflight_messages:
+            return False
+        
+        self._inflight_messages.add(message_id)
+        try:
+            # Streamed messages are not offered again, so the stream reader waits for room
+            self._message_queue.put(message, block=block)
+        except queue.Full:
+            # Leave it on the server; the next poll will offer it again
+            self._inflight_messages.discard(message_id)
+            logger.warning(f"⚠️ Message queue full for {self.agent_id} - deferring message")
+            return False
+        return True
+    
+    def _ensure_message_workers(self) -> None:
+        """Start the message worker threads on first use"""
+        if self._worker_threads:
+            return
+        for index in range(self.message_workers):
+            worker = threading.Thread(
+                target=self._message_worker_loop,
+                name=f"{self.agent_id}-worker-{index}",
+                daemon=True
+            )
+            worker.start()
+            self._worker_threads.append(worker)
+    
+    def _message_worker_loop(self) -> None:
+        """Process queued messages until the process exits"""
+        while True:
+            # Block for one message, then take whatever else is already waiting
+            batch = [self._message_queue.get()]
+            while len(batch) < self.claude_reply_batch_size:
+                try:
+                    batch.append(self._message_queue.get_nowait())
+                except queue.Empty:
+                    break
             
-            # Mark message as processed
-            if message_id:
-                self._mark_message_processed(message_id)
+            try:
+                results = self._process_message_batch(batch)
+            except Exception as e:
+                logger.error(f"❌ Message worker error: {e}")
+                results = [False] * len(batch)
             
-            # Update performance stats
-            self.performance_stats["messages_processed"] += 1
-            self.performance_stats["last_activity"] = datetime.now()
+            for message, processed in zip(batch, results):
+                message_id = message.get('id', '')
+                if processed:
+                    # Mark message as processed
+                    self.processed_messages.add(message_id)
+                    logger.info(f"📨 Processed message: {message.get('message', '')[:50]}...")
+                self._inflight_messages.discard(message_id)
+                self._message_queue.task_done()
+    
+    def _process_message_batch(self, messages: List[Dict[str, Any]]) -> List[bool]:
+        """Process several messages, answering the Claude-bound ones with a single call"""
+        # Agents that override process_message keep their own per-message handling
+        if len(messages) == 1 or type(self).process_message is not BaseIntelligentAgent.process_message:
+            return [self.process_message(message) for message in messages]
+        
+        results = [False] * len(messages)
+        claude_bound = []  # (index, message_text, from_agent)
+        for index, message in enumerate(messages):
+            try:
+                if not self._accept_message(message):
+                    continue
+                message_text = message.get('message', '')
+                from_agent = message.get('from_agent', 'unknown')
+                
+                if self._is_batchable(message, message_text):
+                    self._queue_claude_request(message.get('id', ''), message_text, from_agent)
+                    results[index] = True
+                elif (self.claude_client and not self._is_acknowledgement(message_text)
+                        and self._classify_intent(message_text) not in ("status", "greeting")
+                        and self._get_cached_response(message_text, from_agent) is None):
+                    claude_bound.append((index, message_text, from_agent))
+                else:
+                    results[index] = self._respond(message_text, from_agent)
+            except Exception as e:
+                logger.error(f"❌ Error processing message: {e}")
+        
+        # One combined Claude call per sender, so each prompt holds a single conversation
+        by_sender = {}
+        for entry in claude_bound:
+            by_sender.setdefault(entry[2], []).append(entry)
+        
+        for from_agent, group in by_sender.items():
+            replies = None
+            if len(group) > 1 and self._try_acquire_claude_slot():
+                replies = self._generate_claude_responses_batch(
+                    [(message_text, from_agent) for _, message_text, _ in group]
+                )
             
-            # Add to conversation history
-            self.conversation_history.append({
-                "timestamp": datetime.now().isoformat(),
-                "from": from_agent,
-                "message": message_text,
-                "processed": True
-            })
+            if replies is None:
+                # Single message, rate limited or unparseable batch reply - answer one by one
+                for index, message_text, _ in group:
+                    results[index] = self._respond(message_text, from_agent)
+            else:
+                for (index, message_text, _), reply in zip(group, replies):
+                    if reply:
+                        self._cache_response(message_text, from_agent, reply)
+                    results[index] = bool(reply) and self.send_message(from_agent, reply)
+        
+        return results
+    
+    def _accept_message(self, message: Dict[str, Any]) -> bool:
+        """Deduplicate an incoming message and record it in stats and history"""
+        message_text = message.get('message', '')
+        from_agent = message.get('from_agent', 'unknown')
+        message_id = message.get('id', '')
+        
+        # Check if message has already been processed
+        if message_id and self._is_message_processed(message_id):
+            logger.info(f"🚫 Message {message_id[:8]}... already processed - SKIPPING")
+            return False
+        
+        logger.info(f"📨 Received message from {from_agent}: {message_text[:100]}...")
+        
+        # Mark message as processed
+        if message_id:
+            self._mark_message_processed(message_id)
+        
+        # One clock read serves both the stats and the history entry
+        timestamp = _now_iso()
+        
+        # Update performance stats
+        self.performance_stats["messages_processed"] += 1
+        self.performance_stats["last_activity"] = timestamp
+        
+        # Add to conversation history
+        with self._history_lock:
+            self._hist_ts.append(timestamp)
+            self._hist_from.append(from_agent)
+            self._hist_msg.append(message_text)
+            if self._hist_db is not None:
+                try:
+                    self._hist_db.execute(
+                        "INSERT INTO history (timestamp, from_agent, message) VALUES (?, ?, ?)",
+                        (timestamp, from_agent, message_text)
+                    )
+                except sqlite3.Error as e:
+                    logger.warning(f"⚠️ Failed to persist history entry: {e}")
+        return True
+    
+    def _respond(self, message_text: str, from_agent: str) -> bool:
+        """Generate and send a reply to a single message"""
+        response = self.generate_intelligent_response(message_text, from_agent)
+        
+        if response:
+            self.send_message(from_agent, response)
+            return True
+        
+        # No reply to an acknowledgement is expected, not an error
+        return self._is_acknowledgement(message_text)
+    
+    def process_message(self, message: Dict[str, Any]) -> bool:
+        """Process an incoming message with intelligent response"""
+        try:
+            if not self._accept_message(message):
+                return False
             
-            # Generate intelligent response
-            response = self.generate_intelligent_response(message_text, from_agent)
+            message_text = message.get('message', '')
+            from_agent = message.get('from_agent', 'unknown')
             
-            if response:
-                self.send_message(from_agent, response)
+            # Non-urgent traffic is answered later through the Message Batches API
+            if self._is_batchable(message, message_text):
+                self._queue_claude_request(message.get('id', ''), message_text, from_agent)
                 return True
             
-            return False
+            # Generate intelligent response
+            return self._respond(message_text, from_agent)
             
         except Exception as e:
             logger.error(f"❌ Error processing message: {e}")
@@ -335,48 +986,184 @@ class BaseIntelligentAgent:
     
     def generate_intelligent_response(self, message: str, from_agent: str) -> Optional[str]:
         """Generate intelligent response using Claude - NO FALLBACK ALLOWED"""
+        # Acknowledgements and status reports need no reply
+        if self._is_acknowledgement(message):
+            return None
+        
         if not self.claude_client:
             logger.error(f"❌ Claude client not available for {self.agent_id} - REFUSING TO RESPOND")
             return None
         
+        # Trivial chatter (status pings, greetings) is answered locally
+        intent = self._classify_intent(message)
+        if intent in ("status", "greeting"):
+            return self._generate_trivial_response(message, from_agent, intent)
+
+        # Repeated chatter is answered from the reply cache
+        cached = self._get_cached_response(message, from_agent)
+        if cached is not None:
+            return cached
+
         # Check rate limit before making request
-        if not self._can_make_claude_request():
+        if not self._try_acquire_claude_slot():
             logger.error(f"❌ Rate limit reached for {self.agent_id} - REFUSING TO RESPOND")
             return None
         
-        return self._generate_claude_response(message, from_agent)
+        response = self._generate_claude_response(message, from_agent)
+        if response:
+            self._cache_response(message, from_agent, response)
+        return response
     
-    def _can_make_claude_request(self) -> bool:
-        """Check if we can make a Claude API request without hitting rate limits"""
-        current_time = time.time()
+    def _response_cache_key(self, message: str, from_agent: str) -> Tuple[str, bytes]:
+        """Key a message on a digest of its whitespace-normalized full text"""
+        normalized = _WHITESPACE_RE.sub(' ', message.strip())
+        return (from_agent, hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest())
+    
+    def _get_cached_response(self, message: str, from_agent: str) -> Optional[str]:
+        """Return a cached Claude reply for this message, if any and not expired"""
+        key = self._response_cache_key(message, from_agent)
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is None:
+                return None
+            expires, response = entry
+            if time.monotonic() >= expires:
+                del self._response_cache[key]
+                return None
+            self._response_cache.move_to_end(key)
+        return response
+    
+    def _cache_response(self, message: str, from_agent: str, response: str) -> None:
+        """Store a Claude reply, evicting the least recently used entry when full"""
+        key = self._response_cache_key(message, from_agent)
+        with self._response_cache_lock:
+            self._response_cache[key] = (time.monotonic() + self.response_cache_ttl, response)
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > self.response_cache_size:
+                self._response_cache.popitem(last=False)
+
+    def _is_acknowledgement(self, message: str) -> bool:
+        """Check if a message is a bare acknowledgement that needs no reply"""
+        return _ACK_RE.fullmatch(message) is not None
+    
+    def _classify_intent(self, message: str) -> str:
+        """Classify a message cheaply before deciding whether Claude is needed
+
+        Returns one of "status", "greeting" or "complex". Status and
+        greeting messages are answered by the fallback template; the base agent
+        sends everything to Claude, specific agents may override this.
+        """
+        return "complex"
+
+    def _is_batchable(self, message: Dict[str, Any], message_text: str) -> bool:
+        """Check if a message can wait for a Message Batches API reply"""
+        return (
+            self.claude_client is not None
+            and message.get('defer') is True
+            and not self._is_acknowledgement(message_text)
+            and self._classify_intent(message_text) not in ("status", "greeting")
+        )
+    
+    def _queue_claude_request(self, message_id: str, message: str, from_agent: str) -> None:
+        """Buffer a Claude request for the next Message Batches API submission"""
+        custom_id = message_id or f"msg_{time.time_ns()}"
+        params = self._build_claude_request(message, from_agent)
+        with self._claude_batch_lock:
+            if not self._pending_claude_requests:
+                self._pending_claude_since = time.monotonic()
+            self._pending_claude_requests.append((custom_id, from_agent, params))
+            batch_full = len(self._pending_claude_requests) >= self.claude_batch_size
+        logger.info(f"🗂️ Queued message from {from_agent} for batch processing")
         
-        # Remove requests older than the window
-        self.claude_rate_limit["requests"] = [
-            req_time for req_time in self.claude_rate_limit["requests"]
-            if current_time - req_time < (self.claude_rate_limit["window_minutes"] * 60)
-        ]
+        if batch_full:
+            self._flush_claude_batch()
+    
+    def _maybe_flush_claude_batch(self) -> None:
+        """Flush the pending batch if it has waited long enough"""
+        if (self._pending_claude_requests and
+                time.monotonic() - self._pending_claude_since >= self.claude_batch_max_age):
+            self._flush_claude_batch()
+    
+    def _flush_claude_batch(self) -> Optional[str]:
+        """Submit all pending Claude requests as a single message batch"""
+        with self._claude_batch_lock:
+            pending = self._pending_claude_requests
+            self._pending_claude_requests = []
+        if not pending:
+            return None
         
-        # Check if we're under the limit
-        return len(self.claude_rate_limit["requests"]) < self.claude_rate_limit["max_requests"]
+        try:
+            batch = self.claude_client.messages.batches.create(
+                requests=[{"custom_id": custom_id, "params": params} for custom_id, _, params in pending]
+            )
+            self._claude_batches[batch.id] = {custom_id: from_agent for custom_id, from_agent, _ in pending}
+            self._claude_batch_next_check[batch.id] = time.monotonic() + self.claude_batch_poll_interval
+            logger.info(f"📦 Submitted Claude batch {batch.id} with {len(pending)} requests")
+            return batch.id
+        except Exception as e:
+            # These messages are already marked processed, so put them back for the next flush
+            with self._claude_batch_lock:
+                self._pending_claude_requests[:0] = pending
+                self._pending_claude_since = time.monotonic()
+            logger.error(f"❌ Claude batch submission failed, retrying in {self.claude_batch_max_age}s: {e}")
+            return None
+    
+    def _collect_claude_batches(self) -> None:
+        """Send replies for any submitted batches that have finished processing"""
+        now = time.monotonic()
+        for batch_id, recipients in list(self._claude_batches.items()):
+            # Batches take minutes, so only ask the API about each one every poll interval
+            if now < self._claude_batch_next_check.get(batch_id, 0.0):
+                continue
+            self._claude_batch_next_check[batch_id] = now + self.claude_batch_poll_interval
+            try:
+                batch = self.claude_client.messages.batches.retrieve(batch_id)
+                if batch.processing_status != "ended":
+                    continue
+                
+                for entry in self.claude_client.messages.batches.results(batch_id):
+                    from_agent = recipients.get(entry.custom_id)
+                    if from_agent and entry.result.type == "succeeded":
+                        self.send_message(from_agent, entry.result.message.content[0].text)
+                    elif from_agent:
+                        logger.error(f"❌ Batch request {entry.custom_id} {entry.result.type} - REFUSING TO RESPOND")
+                
+                del self._claude_batches[batch_id]
+                self._claude_batch_next_check.pop(batch_id, None)
+            except Exception as e:
+                logger.error(f"❌ Error collecting Claude batch {batch_id}: {e}")
+    
+    def _evict_expired_claude_requests(self, now: float) -> None:
+        """Drop requests that have left the rate limit window (caller holds the lock)"""
+        cutoff = now - self.claude_rate_limit["window_minutes"] * 60
+        request_times = self._claude_req_times
+        while request_times and request_times[0] <= cutoff:
+            request_times.popleft()
+    
+    def _try_acquire_claude_slot(self) -> bool:
+        """Reserve a Claude API request under the rate limit, atomically across worker threads"""
+        with self._claude_rate_lock:
+            now = time.monotonic()
+            self._evict_expired_claude_requests(now)
+            if len(self._claude_req_times) >= self.claude_rate_limit["max_requests"]:
+                return False
+            self._claude_req_times.append(now)
+            self.performance_stats["claude_calls"] = self.performance_stats.get("claude_calls", 0) + 1
+            return True
     
-    def _record_claude_request(self):
-        """Record a Claude API request for rate limiting"""
-        self.claude_rate_limit["requests"].append(time.time())
-        self.performance_stats["claude_calls"] = self.performance_stats.get("claude_calls", 0) + 1
+    def _claude_requests_remaining(self) -> int:
+        """Number of Claude API requests still available in the current window"""
+        with self._claude_rate_lock:
+            self._evict_expired_claude_requests(time.monotonic())
+            return self.claude_rate_limit["max_requests"] - len(self._claude_req_times)
     
     def _is_message_processed(self, message_id: str) -> bool:
         """Check if a message has already been processed"""
         return message_id in self.processed_messages
     
     def _mark_message_processed(self, message_id: str):
-        """Mark a message as processed and clean up old entries"""
+        """Mark a message as processed"""
         self.processed_messages.add(message_id)
-        
-        # Keep only the most recent message IDs
-        if len(self.processed_messages) > self.max_processed_messages:
-            # Convert to list, remove oldest, convert back to set
-            message_list = list(self.processed_messages)
-            self.processed_messages = set(message_list[-self.max_processed_messages:])
     
     def clear_processed_messages(self):
         """Clear all processed message IDs (useful for debugging)"""
@@ -386,39 +1173,106 @@ class BaseIntelligentAgent:
     def _generate_claude_response(self, message: str, from_agent: str) -> Optional[str]:
         """Generate response using Claude API - NO FALLBACK ALLOWED"""
         try:
-            # Clean the message by removing agent mentions before sending to Claude
-            clean_message = message
-            # Remove common agent mentions
-            for agent in ['@maya', '@blaze', '@jugad', '@ai-manager']:
-                clean_message = clean_message.replace(agent, '').strip()
+            # Stream the reply and stop reading once it is long enough, closing the stream early
+            chunks = []
+            reply = ""
+            with self.claude_client.messages.stream(**self._build_claude_request(message, from_agent)) as stream:
+                for text in stream.text_stream:
+                    chunks.append(text)
+                    reply = "".join(chunks)
+                    sentence_ends = [match.end() for match in _SENTENCE_END_RE.finditer(reply)]
+                    if len(sentence_ends) >= self.claude_reply_max_sentences:
+                        # Drop the start of the next sentence that arrived in the same chunk
+                        reply = reply[:sentence_ends[self.claude_reply_max_sentences - 1]]
+                        break
+                    if len(reply) > self.claude_reply_max_chars:
+                        break
             
-            # Send the clean message with context about agent-to-agent communication
-            contextual_message = f"You are {self.agent_name}, an AI agent specialized in {self.description}. You are receiving a message from another AI agent named {from_agent}: \"{clean_message}\"\n\nRespond as one AI agent to another - be direct and helpful."
+            return reply.strip()
             
+        except Exception as e:
+            logger.error(f"❌ Claude response generation failed: {e}")
+            return None  # NO FALLBACK - REFUSE TO RESPOND
+    
+    def _generate_claude_responses_batch(self, messages: List[Tuple[str, str]]) -> Optional[List[str]]:
+        """Answer several (message, from_agent) pairs with one Claude call
+
+        Returns None when the reply is not a JSON array of one string per
+        message, so the caller can fall back to per-message requests.
+        """
+        try:
+            numbered = "\n".join(
+                f"{index}. From {from_agent}: {self._clean_message(message)}"
+                for index, (message, from_agent) in enumerate(messages, 1)
+            )
             response = self.claude_client.messages.create(
                 model=self.get_current_model(),
-                max_tokens=300,
-                messages=[{"role": "user", "content": contextual_message}]
+                max_tokens=min(self.claude_reply_max_tokens * len(messages), 4096),
+                system=self._claude_system_block,
+                messages=[{"role": "user", "content": _BATCH_REPLY_INSTRUCTIONS + numbered}]
             )
             
-            return response.content[0].text
-            
+            text = response.content[0].text
+            fenced = _CODE_FENCE_RE.fullmatch(text)
+            replies = _loads(fenced.group(1) if fenced else text)
+            if (isinstance(replies, list) and len(replies) == len(messages)
+                    and all(isinstance(reply, str) for reply in replies)):
+                return replies
+            logger.warning(f"⚠️ Batched Claude reply had the wrong shape - answering {len(messages)} messages individually")
+        except json.JSONDecodeError:
+            logger.warning(f"⚠️ Batched Claude reply was not JSON - answering {len(messages)} messages individually")
         except Exception as e:
-            logger.error(f"❌ Claude response generation failed: {e}")
-            return None  # NO FALLBACK - REFUSE TO RESPOND
+            logger.error(f"❌ Batched Claude response generation failed: {e}")
+        return None
+    
+    def _clean_message(self, message: str) -> str:
+        """Remove agent mentions before sending a message to Claude"""
+        clean_message = message
+        # Remove common agent mentions
+        for agent in ['@maya', '@blaze', '@jugad', '@ai-manager']:
+            clean_message = clean_message.replace(agent, '').strip()
+        return clean_message
+    
+    def _build_claude_request(self, message: str, from_agent: str) -> Dict[str, Any]:
+        """Build the messages.create parameters for replying to an agent message"""
+        # Clean the message by removing agent mentions before sending to Claude
+        clean_message = self._clean_message(message)
+        
+        # Only the per-message part goes in the user turn; the persona is in the cached system block
+        contextual_message = f"You are receiving a message from another AI agent named {from_agent}: \"{clean_message}\""
+        
+        return {
+            "model": self.get_current_model(),
+            "max_tokens": self.claude_reply_max_tokens,
+            "system": self._claude_system_block,
+            "messages": [{"role": "user", "content": contextual_message}]
+        }
+    
+    def _build_system_prompt(self) -> str:
+        """Build the static agent persona shared by every Claude call"""
+        capabilities = "\n".join(f"- {capability}" for capability in self.capabilities)
+        prompt_prefix = f"You are {self.agent_name}, an AI agent specialized in {self.description}.\n\n"
+        return f"{prompt_prefix}Your capabilities:\n{capabilities}\n\n{_PROMPT_RULES}"
+    
+    def _generate_trivial_response(self, message: str, from_agent: str, intent: str) -> Optional[str]:
+        """Answer a status ping or greeting without Claude; agents may override this"""
+        return self._generate_fallback_response(message, from_agent)
     
     def _generate_fallback_response(self, message: str, from_agent: str) -> Optional[str]:
         """Generate fallback response when Claude is unavailable"""
         # This will be overridden by specific agents
-        return f"Hello {from_agent}! I'm {self.agent_name}. I received your message: '{message[:100]}...' but I'm currently operating in fallback mode."
+        return self._FALLBACK_TMPL.format_map({
+            "from_agent": from_agent,
+            "agent_name": self.agent_name,
+            "snippet": message[:100]
+        })
     
     def read_project_file(self, file_path: str) -> str:
         """Read a project file and return its contents"""
         try:
-            from pathlib import Path
             file = Path(file_path)
             if file.exists():
-                return file.read_text()
+                return _read_text(file)
             else:
                 return f"File not found: {file_path}"
         except Exception as e:
@@ -427,7 +1281,6 @@ class BaseIntelligentAgent:
     def analyze_project_context(self, project_path: str) -> Dict[str, Any]:
         """Analyze project context by reading key files"""
         try:
-            from pathlib import Path
             project = Path(project_path)
             
             context = {
@@ -438,62 +1291,118 @@ class BaseIntelligentAgent:
                 "config_files": {}
             }
             
+            files_found, ai_context_files = self._project_listing(project)
+            
             # Look for common project files
-            common_files = ["README.md", "package.json", "pyproject.toml", "requirements.txt", "setup.py"]
-            for file_name in common_files:
+            for file_name in files_found:
                 file_path = project / file_name
-                if file_path.exists():
-                    context["files_found"].append(file_name)
-                    if file_name == "README.md":
-                        context["readme_content"] = file_path.read_text()
-                    elif file_name == "package.json":
-                        try:
-                            import json
-                            context["package_info"] = json.loads(file_path.read_text())
-                        except:
-                            context["package_info"] = {"error": "Could not parse package.json"}
+                context["files_found"].append(file_name)
+                if file_name == "README.md":
+                    context["readme_content"] = _read_text(file_path)
+                elif file_name == "package.json":
+                    try:
+                        context["package_info"] = _read_json(file_path)
+                    except:
+                        context["package_info"] = {"error": "Could not parse package.json"}
             
             # Look for AI context directory
-            ai_context = project / "ai_context"
-            if ai_context.exists():
-                context["ai_context_files"] = []
-                for file in ai_context.iterdir():
-                    if file.is_file():
-                        context["ai_context_files"].append(file.name)
-                        if file.suffix == ".json":
-                            try:
-                                import json
-                                context["config_files"][file.name] = json.loads(file.read_text())
-                            except:
-                                context["config_files"][file.name] = {"error": "Could not parse JSON"}
+            if ai_context_files is not None:
+                ai_context = project / "ai_context"
+                context["ai_context_files"] = list(ai_context_files)
+                for name in ai_context_files:
+                    if name.endswith(".json"):
+                        try:
+                            context["config_files"][name] = _read_json(ai_context / name)
+                        except:
+                            context["config_files"][name] = {"error": "Could not parse JSON"}
             
             return context
         except Exception as e:
             return {"error": str(e)}
-        """Build context for Claude based on agent's current state"""
-        context = f"""
-Agent Status: {self.status}
-Current Task: {self.current_task or 'None'}
-Tasks Completed: {self.performance_stats['tasks_completed']}
-Uptime: {datetime.now() - self.performance_stats['uptime_start']}
-"""
-        return context
+    
+    def _project_listing(self, project: Path) -> Tuple[List[str], Optional[List[str]]]:
+        """Project files found and ai_context file names, rescanned only when a directory mtime changes"""
+        try:
+            root_mtime = project.stat().st_mtime_ns
+        except FileNotFoundError:
+            return [], None
+        ai_context = project / "ai_context"
+        try:
+            ai_mtime = ai_context.stat().st_mtime_ns
+        except FileNotFoundError:
+            ai_mtime = None
+        
+        key = str(project)
+        cached = self._project_listing_cache.get(key)
+        if cached is not None and cached[0] == (root_mtime, ai_mtime):
+            return cached[1], cached[2]
+        
+        files_found = [name for name in _PROJECT_FILES if (project / name).exists()]
+        ai_context_files = None
+        if ai_mtime is not None:
+            ai_context_files = [entry.name for entry in os.scandir(ai_context) if entry.is_file()]
+        self._project_listing_cache[key] = ((root_mtime, ai_mtime), files_found, ai_context_files)
+        return files_found, ai_context_files
+    
+    @property
+    def conversation_history(self) -> List[Dict[str, Any]]:
+        """Conversation history as a list of message records"""
+        with self._history_lock:
+            return [
+                {"timestamp": timestamp, "from": from_agent, "message": message, "processed": True}
+                for timestamp, from_agent, message in zip(self._hist_ts, self._hist_from, self._hist_msg)
+            ]
+    
+    def _open_history_db(self) -> Optional[sqlite3.Connection]:
+        """Open the history database and reload the most recent messages"""
+        try:
+            db_dir = os.path.dirname(self.history_db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            
+            # Autocommit; worker threads share the connection under _history_lock
+            db = sqlite3.connect(self.history_db_path, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS history "
+                "(id INTEGER PRIMARY KEY, timestamp TEXT, from_agent TEXT, message TEXT)"
+            )
+            
+            rows = db.execute(
+                "SELECT timestamp, from_agent, message FROM history ORDER BY id DESC LIMIT ?",
+                (self.max_history,)
+            ).fetchall()
+            for timestamp, from_agent, message in reversed(rows):
+                self._hist_ts.append(timestamp)
+                self._hist_from.append(from_agent)
+                self._hist_msg.append(message)
+            
+            logger.info(f"📚 Loaded {len(rows)} history entries for {self.agent_id}")
+            return db
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ History database unavailable for {self.agent_id}, keeping history in memory only: {e}")
+            return None
     
     def _get_recent_context(self) -> str:
         """Get recent conversation context"""
-        recent_messages = self.conversation_history[-5:]  # Last 5 messages
+        with self._history_lock:
+            start = max(0, len(self._hist_from) - 5)  # Last 5 messages
+            recent_messages = list(islice(zip(self._hist_from, self._hist_msg), start, None))
         context_lines = []
-        for msg in recent_messages:
-            context_lines.append(f"- {msg['from']}: {msg['message'][:100]}...")
+        for from_agent, message in recent_messages:
+            context_lines.append(f"- {from_agent}: {message[:100]}...")
         return "\n".join(context_lines) if context_lines else "No recent context"
     
     def add_task(self, task: Dict[str, Any]) -> None:
         """Add a task to the agent's queue"""
+        if len(self.task_queue) == self.max_task_queue:
+            logger.warning(f"⚠️ Task queue full for {self.agent_id} - dropping oldest task {self.task_queue[0]['id']}")
         self.task_queue.append({
-            "id": f"task_{int(time.time())}_{len(self.task_queue)}",
+            "id": f"task_{time.time_ns()}_{len(self.task_queue)}",
             "task": task,
             "status": "pending",
-            "created_at": datetime.now().isoformat()
+            "created_at": _now_iso()
         })
         logger.info(f"📋 Task added to {self.agent_id} queue")
     
@@ -502,7 +1411,7 @@ Uptime: {datetime.now() - self.performance_stats['uptime_start']}
         if not self.task_queue:
             return False
         
-        task = self.task_queue.pop(0)
+        task = self.task_queue.popleft()
         self.current_task = task
         
         try:
@@ -529,6 +1438,17 @@ Uptime: {datetime.now() - self.performance_stats['uptime_start']}
         """Execute a specific task - to be implemented by specific agents"""
         raise NotImplementedError("Subclasses must implement execute_task")
     
+    def close(self) -> None:
+        """Stop the heartbeat, send any queued messages and release pooled HTTP connections and the history database"""
+        self._heartbeat_stop.set()
+        # One last attempt; _flush_outbox also cancels any pending retry timer
+        self._flush_outbox(requeue=False)
+        self.http.close()
+        with self._history_lock:
+            if self._hist_db is not None:
+                self._hist_db.close()
+                self._hist_db = None
+    
     def get_status_report(self) -> Dict[str, Any]:
         """Get comprehensive status report"""
         return {
@@ -537,9 +1457,11 @@ Uptime: {datetime.now() - self.performance_stats['uptime_start']}
             "status": self.status,
             "capabilities": self.capabilities,
             "performance_stats": self.performance_stats,
+            "uptime_seconds": int(time.monotonic() - self._uptime_start_mono),
             "task_queue_length": len(self.task_queue),
-            "conversation_history_length": len(self.conversation_history),
+            "conversation_history_length": len(self._hist_ts),
             "claude_enabled": self.claude_client is not None,
+            "claude_requests_remaining": self._claude_requests_remaining(),
             "current_task": self.current_task,
             "last_activity": self.performance_stats["last_activity"]
         }
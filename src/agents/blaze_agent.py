@@ -4,44 +4,82 @@ Blaze Backup Agent - Real Project Integration
 Works with the actual blackblaze2-backup project
 """
 
+import io
 import os
+import re
 import sys
 import time
-import json
-import requests
+import random
+import shlex
+import subprocess
+import logging
 from pathlib import Path
-from datetime import datetime
+from functools import lru_cache
 from typing import Optional, Dict, Any
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.agents.base_intelligent_agent import BaseIntelligentAgent
+from src.agents.base_intelligent_agent import BaseIntelligentAgent, _count_proc_matching, _now_iso, _read_json, _read_text
 from src.utils.environment import setup_environment
 
 # FORCE API KEY LOADING - NO FALLBACK
 setup_environment()
 
+# Logging is configured once by the base agent module; just take a named logger
+logger = logging.getLogger(__name__)
+
+# The real backup project this agent manages, resolved once at import
+_PROJECT_PATH = Path("/home/yamnik/Projects/blackblaze-backup").resolve()
+
+# Shared by every BlazeAgent instance rather than rebuilt per constructor call
+_CAPABILITIES = (
+    "gui_development",
+    "backup_management",
+    "cloud_storage",
+    "cross_platform_packaging",
+    "pyside6_development",
+    "aws_s3_integration"
+)
+
+# Backup configuration files reported by get_backup_config, in report order
+_CONFIG_FILES = ("sample.env", ".env", "pyproject.toml")
+
+# Mention check compiled once instead of lowercasing every message
+_BLAZE_MENTION_RE = re.compile(r'@blaze', re.IGNORECASE)
+
+# Command lines of backup processes (matched against /proc/<pid>/cmdline)
+_BACKUP_PROCESS_RE = re.compile(rb'main\.py|bb2backup')
+
+@lru_cache(maxsize=8)
+def _readme_description(readme: str) -> str:
+    """First non-heading line of a README; memoized on the (cached) README text"""
+    for line in io.StringIO(readme):
+        if line.strip() and not line.startswith('#'):
+            return line.strip()
+    return "No description available"
+
 class BlazeAgent(BaseIntelligentAgent):
+    __slots__ = (
+        "project_path", "api_base", "logger",
+        "project_status_ttl", "_project_status_cache"
+    )
+    
     def __init__(self):
         super().__init__(
             agent_id="blaze-agent",
             agent_name="Blaze GUI Backup Agent",
             description="Intelligent agent for the BlackBlaze B2 Backup Tool - a cross-platform GUI application",
-            capabilities=[
-                "gui_development",
-                "backup_management",
-                "cloud_storage",
-                "cross_platform_packaging",
-                "pyside6_development",
-                "aws_s3_integration"
-            ]
+            capabilities=_CAPABILITIES
         )
-        self.project_path = Path("/home/yamnik/Projects/blackblaze-backup")
+        self.project_path = _PROJECT_PATH
         self.api_base = "http://localhost:5000/api"
         
         # Set up logger
-        import logging
-        self.logger = logging.getLogger(f"blaze-agent")
+        self.logger = logger
+        
+        # Project status (git + /proc scan) is reused for this many seconds
+        self.project_status_ttl = 30
+        self._project_status_cache = (0.0, None)  # (monotonic expiry, status)
     
     def process_message(self, message: Dict[str, Any]) -> bool:
         """Process messages - ONLY respond to @blaze mentions"""
@@ -52,7 +90,7 @@ class BlazeAgent(BaseIntelligentAgent):
             self.logger.info(f"📨 Received message from {from_agent}: {message_text[:100]}...")
             
             # STRICT RULE: Only respond if explicitly mentioned with @blaze
-            if '@blaze' not in message_text.lower():
+            if not _BLAZE_MENTION_RE.search(message_text):
                 self.logger.info("🚫 Message does not contain @blaze mention - IGNORING")
                 return False
             
@@ -64,7 +102,16 @@ class BlazeAgent(BaseIntelligentAgent):
             return False
         
     def get_project_status(self):
-        """Get the current status of the backup project"""
+        """Get the current status of the backup project, reusing a recent result"""
+        expires, status = self._project_status_cache
+        now = time.monotonic()
+        if status is None or now >= expires:
+            status = self._collect_project_status()
+            self._project_status_cache = (now + self.project_status_ttl, status)
+        return status
+    
+    def _collect_project_status(self):
+        """Check the backup project on disk"""
         try:
             if not self.project_path.exists():
                 return {"status": "project_not_found", "error": "Project directory not found"}
@@ -75,18 +122,18 @@ class BlazeAgent(BaseIntelligentAgent):
                 return {"status": "incomplete", "error": "main.py not found"}
             
             # Check git status
-            git_status = self._run_command("git status --porcelain", cwd=self.project_path)
+            git_status = self._run_command(["git", "-C", str(self.project_path), "status", "--porcelain"])
             
             # Check if there are any running backup processes
-            backup_processes = self._run_command("ps aux | grep -E 'main.py|bb2backup' | grep -v grep")
+            backup_processes = _count_proc_matching(_BACKUP_PROCESS_RE)
             
             return {
                 "status": "active",
                 "project_path": str(self.project_path),
                 "main_py_exists": main_py.exists(),
                 "git_status": git_status.strip() if git_status else "clean",
-                "backup_processes": len(backup_processes.strip().split('\n')) if backup_processes.strip() else 0,
-                "last_check": datetime.now().isoformat()
+                "backup_processes": backup_processes,
+                "last_check": _now_iso()
             }
         except Exception as e:
             return {"status": "error", "error": str(e)}
@@ -94,19 +141,25 @@ class BlazeAgent(BaseIntelligentAgent):
     def get_backup_config(self):
         """Get backup configuration information"""
         try:
-            config_files = [
-                self.project_path / "sample.env",
-                self.project_path / ".env",
-                self.project_path / "pyproject.toml"
-            ]
+            # One directory read finds which config files exist; DirEntry.is_file uses the cached d_type
+            present = {}
+            try:
+                with os.scandir(self.project_path) as entries:
+                    for entry in entries:
+                        if entry.name in _CONFIG_FILES and entry.is_file():
+                            present[entry.name] = Path(entry.path)
+            except FileNotFoundError:
+                pass
             
+            # Reads are memoized on mtime/size, so unchanged files cost a single stat
             config_data = {}
-            for config_file in config_files:
-                if config_file.exists():
+            for name in _CONFIG_FILES:
+                if name in present:
+                    config_file = present[name]
                     if config_file.suffix == '.json':
-                        config_data[config_file.name] = json.loads(config_file.read_text())
+                        config_data[name] = _read_json(config_file)
                     else:
-                        config_data[config_file.name] = config_file.read_text()
+                        config_data[name] = _read_text(config_file)
             
             return {
                 "config_files": list(config_data.keys()),
@@ -120,31 +173,33 @@ class BlazeAgent(BaseIntelligentAgent):
         """Run a backup status check"""
         try:
             # Check if the backup tool can be executed
-            result = self._run_command("python3 main.py --help", cwd=self.project_path)
+            result = self._run_command(["python3", "main.py", "--help"], cwd=self.project_path)
             return {
                 "executable": True,
                 "help_output": result,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
         except Exception as e:
             return {
                 "executable": False,
                 "error": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
         
-    def _run_command(self, command, cwd=None):
-        """Run a shell command and return output"""
-        import subprocess
+    def _run_command(self, command, cwd=None, timeout=5):
+        """Run a command directly (no shell) and return output"""
         try:
+            if isinstance(command, str):
+                command = shlex.split(command)
+            # Only stdout is used; stderr is discarded and stdout decoded in one shot
             result = subprocess.run(
                 command, 
-                shell=True, 
-                capture_output=True, 
-                text=True, 
-                cwd=cwd
+                stdout=subprocess.PIPE, 
+                stderr=subprocess.DEVNULL, 
+                cwd=cwd,
+                timeout=timeout
             )
-            return result.stdout
+            return result.stdout.decode('utf-8', 'replace')
         except Exception as e:
             return f"Error: {e}"
     
@@ -157,21 +212,16 @@ class BlazeAgent(BaseIntelligentAgent):
             
             context_data = {}
             
-            # Read core.json
-            core_file = context_path / "core.json"
-            if core_file.exists():
-                import json
-                context_data["core"] = json.loads(core_file.read_text())
-            
-            # Read README.md
-            readme_file = context_path / "README.md"
-            if readme_file.exists():
-                context_data["readme"] = readme_file.read_text()
-            
-            # Read architecture.json
-            arch_file = context_path / "architecture.json"
-            if arch_file.exists():
-                context_data["architecture"] = json.loads(arch_file.read_text())
+            # Context files rarely change - the mtime-keyed cache skips re-reading and re-parsing them
+            for key, name, reader in (
+                ("core", "core.json", _read_json),
+                ("readme", "README.md", _read_text),
+                ("architecture", "architecture.json", _read_json),
+            ):
+                try:
+                    context_data[key] = reader(context_path / name)
+                except FileNotFoundError:
+                    continue
             
             return context_data
         except Exception as e:
@@ -206,85 +256,27 @@ class BlazeAgent(BaseIntelligentAgent):
             
             # Extract from README
             if "readme" in context:
-                readme = context["readme"]
-                # Extract description from README
-                lines = readme.split('\n')
-                for line in lines:
-                    if line.strip() and not line.startswith('#'):
-                        overview["description"] = line.strip()
-                        break
+                overview["description"] = _readme_description(context["readme"])
             
             return overview
         except Exception as e:
             return {"error": str(e)}
-        """Build context for Claude with project-specific information"""
-        try:
-            project_status = self.get_project_status()
-            backup_config = self.get_backup_config()
-            
-            context = f"""Project Information:
-- Project Path: {self.project_path}
-- Project Status: {project_status['status']}
-- Main Executable: {project_status.get('main_py_exists', False)}
-- Config Files: {len(backup_config.get('config_files', []))}
-- Project Ready: {backup_config.get('project_ready', False)}
-
-Available Commands:
-- get_project_status(): Get current project status
-- get_backup_config(): Get backup configuration
-- run_backup_check(): Check if backup tool is executable
-- analyze_project_files(): Analyze project structure
-
-You are the Blaze Backup Agent managing the blackblaze2-backup project - a Python-based backup tool for BackBlaze B2 S3 storage."""
-            
-            return context
-        except Exception as e:
-            return f"Error building context: {e}"
     
-    def _build_claude_context(self, message: str, from_agent: str) -> str:
-        """Build context for Claude with project-specific information"""
-        try:
-            # Analyze project context
-            project_context = self.analyze_project_context(str(self.project_path))
-            
-            context = f"""CRITICAL: You are about the BlackBlaze B2 Backup Tool - a GUI backup application.
-
-Project Information:
-- Project Path: {self.project_path}
-- Files Found: {project_context.get('files_found', [])}
-- AI Context Files: {project_context.get('ai_context_files', [])}
-
-ACTUAL PROJECT DETAILS:"""
-            
-            # Add AI context information
-            if 'config_files' in project_context:
-                for file_name, file_data in project_context['config_files'].items():
-                    if file_name == 'core.json' and 'project' in file_data:
-                        project_info = file_data['project']
-                        context += f"""
-- Project Name: {project_info.get('name', 'Unknown')}
-- Project Type: {project_info.get('type', 'Unknown')}
-- Tech Stack: {project_info.get('tech_stack', [])}
-- Version: {project_info.get('current_version', 'Unknown')}
-- Key Features: {project_info.get('key_features', [])}
-- Core Modules: {project_info.get('core_modules', [])}"""
-            
-            # Add README content
-            if project_context.get('readme_content'):
-                readme_lines = project_context['readme_content'].split('\n')[:10]
-                context += f"\n- README Content:\n" + "\n".join(readme_lines)
-            
-            context += f"""
-
-IMPORTANT: This is the BlackBlaze B2 Backup Tool - a cross-platform GUI backup application using Python, PySide6, and AWS S3 (BackBlaze B2).
-It is NOT a generic backup agent - it is a specific GUI application for cloud backup.
-
-You are the Blaze Backup Agent managing this specific GUI backup application project."""
-            
-            return context
-        except Exception as e:
-            return f"Error building context: {e}"
-    def run(self):
+    def _heartbeat_tick(self):
+        """Report project status with each heartbeat in a single state update"""
+        project_status = self.get_project_status()
+        if project_status['status'] == 'active':
+            self.send_state(
+                pulse_message=f"Backup project monitoring: {project_status['status']}. Ready for operations.",
+                pulse_status='online'
+            )
+        else:
+            self.send_state(
+                pulse_message=f"Backup project status: {project_status['status']}",
+                pulse_status='warning'
+            )
+    
+    def run(self, heartbeat_interval=10, message_check_interval=2, max_backoff=300):
         """Main agent loop"""
         self.logger.info("Blaze Backup Agent starting...")
         
@@ -295,36 +287,40 @@ You are the Blaze Backup Agent managing this specific GUI backup application pro
         
         self.logger.info("Blaze Backup Agent registered successfully")
         
+        # Heartbeat plus project status pulse run on their own thread, one request per tick
+        self.start_heartbeat(heartbeat_interval)
+        
+        # Message checks fire at a fixed monotonic deadline, immune to wall-clock jumps
+        next_message_check = time.monotonic()
+        
+        # Failed checks back off exponentially (with jitter) instead of retrying at full rate
+        backoff = 1.0
+        
         # Main loop
         while True:
             try:
-                # Send heartbeat
-                self.send_heartbeat()
+                now = time.monotonic()
                 
                 # Check for messages
-                self.check_for_messages()
-                
-                # Get project status and send pulse update
-                project_status = self.get_project_status()
-                if project_status['status'] == 'active':
-                    self.send_pulse_update(
-                        message=f"Backup project monitoring: {project_status['status']}. Ready for operations.",
-                        status='online'
-                    )
-                else:
-                    self.send_pulse_update(
-                        message=f"Backup project status: {project_status['status']}",
-                        status='warning'
-                    )
+                if now >= next_message_check:
+                    if self.check_for_messages():
+                        backoff = 1.0
+                        next_message_check = max(next_message_check + message_check_interval, now)
+                    else:
+                        next_message_check = now + backoff + random.random()
+                        backoff = min(backoff * 2, max_backoff)
                 
-                time.sleep(30)  # Check every 30 seconds
+                # Sleep until the next check is due
+                time.sleep(max(0.0, next_message_check - time.monotonic()))
                 
             except KeyboardInterrupt:
                 self.logger.info("Blaze Backup Agent shutting down...")
+                self.close()
                 break
             except Exception as e:
                 self.logger.error(f"Error in main loop: {e}")
-                time.sleep(60)  # Wait longer on error
+                time.sleep(backoff + random.random())
+                backoff = min(backoff * 2, max_backoff)
 
 if __name__ == "__main__":
     agent = BlazeAgent()
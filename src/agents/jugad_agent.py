@@ -9,14 +9,16 @@ Designed to be flexible and adaptable to different types of work.
 import os
 import sys
 import time
-import json
 import logging
-import requests
+import operator
+import queue
 import re
+import threading
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.agents.base_intelligent_agent import BaseIntelligentAgent
+from src.agents.base_intelligent_agent import BaseIntelligentAgent, _dumps
 from src.utils.environment import setup_environment
 
 # FORCE API KEY LOADING - NO FALLBACK
@@ -25,22 +27,154 @@ setup_environment()
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-# Add AI Manager to path for base classes
-sys.path.append('/home/yamnik/Projects/ai-manager/src')
+# Fixed instruction-analysis prompt, sent as a cached system block so only the instruction varies
+_INSTRUCTION_SYSTEM_PROMPT = """You are Jugad, a general purpose instruction-following agent.
 
-# Import environment setup
-try:
-    from utils.environment import setup_environment
-    setup_environment()
-except ImportError:
-    # Fallback if environment module not available
-    pass
+Analyze the instruction you receive and determine:
+1. What type of task is being requested?
+2. What specific actions should I take?
+3. What files or commands might be needed?
+
+Respond with a clear action plan. Examples:
+- "create_file: Create a new Python script for data processing"
+- "execute_command: Run git init to initialize the project"
+- "research: Research best practices for web development"
+- "setup_project: Set up a new React project structure"
+
+Be specific about what needs to be done."""
+_INSTRUCTION_SYSTEM_BLOCK = [{
+    "type": "text",
+    "text": _INSTRUCTION_SYSTEM_PROMPT,
+    "cache_control": {"type": "ephemeral"}
+}]
+
+_JUGAD_MENTION_RE = re.compile(r"@jugad", re.IGNORECASE)
+
+# Simple-question cues fused into one pattern; "what is <n>" also covers the arithmetic forms
+_SIMPLE_QUESTION_RE = re.compile(
+    r"what is \d+|calculate \d+\+\d+|answer with only|just tell me|how much is \d+",
+    re.IGNORECASE
+)
+
+# Answer phrasings in priority order (first pattern to match wins, wherever it occurs)
+_ANSWER_RES = tuple(re.compile(pattern) for pattern in (
+    r"answer is (\d+)",
+    r"result is (\d+)",
+    r"equals (\d+)",
+    r"= (\d+)",
+    r"answer: (\d+)",
+    r"result: (\d+)",
+    r"simply: (\d+)"
+))
+# Two-operand arithmetic answered locally instead of asking Claude; the expression must end
+# the message so "2+3*4" or "100 - 20% of 50" still go to Claude
+_ARITHMETIC_RE = re.compile(
+    r"(?:what is|calculate|how much is)\s+(\d+(?:\.\d+)?)\s*([+\-*/×÷])\s*(\d+(?:\.\d+)?)(?=\s*[?.!]?\s*$)",
+    re.IGNORECASE
+)
+_ARITHMETIC_OPS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "×": operator.mul,
+    "/": operator.truediv,
+    "÷": operator.truediv
+}
+# Instruction trigger -> command to run, matched with one case-insensitive pass
+_COMMAND_TRIGGERS = {
+    "git init": "git init",
+    "npm init": "npm init -y"
+}
+_COMMAND_TRIGGER_RE = re.compile("|".join(map(re.escape, _COMMAND_TRIGGERS)), re.IGNORECASE)
+_CALCULATION_RE = re.compile(r"(\d+)\s*[+\-*×/]\s*(\d+)\s*=\s*(\d+)")
+
+# Markdown bodies written to the Jugad project, filled in with format_map
+_ANALYSIS_TMPL = """# Claude Analysis - {timestamp}
+
+## Original Instruction:
+{instruction}
+
+## Claude's Intelligent Analysis:
+{analysis}
+
+## Status:
+Task analyzed and processed by Jugad agent using Claude AI
+"""
+_TASK_OUTPUT_TMPL = """# Task Output - {timestamp}
+
+## Original Instruction:
+{instruction}
+
+## Claude Analysis:
+{analysis}
+
+## Status:
+Task completed by Jugad agent
+"""
+_PROJECT_README_TMPL = """# Jugad Project
+
+Created by Jugad Agent on {timestamp}
+
+## Purpose
+{instruction}
+
+## Status
+Project initialized and ready for development.
+
+## Next Steps
+- Add project-specific files
+- Set up development environment
+- Begin implementation
+"""
+_RESEARCH_TMPL = """# Research Output - {timestamp}
 
-from agents.base_intelligent_agent import BaseIntelligentAgent
+## Research Topic
+{instruction}
+
+## Analysis
+{analysis}
+
+## Findings
+Research completed by Jugad agent. Please review and provide more specific research requirements if needed.
+
+## Next Steps
+- Refine research scope
+- Gather specific information
+- Create implementation plan
+"""
+_TASK_LOG_HEADER = "# Jugad Task Log\n\n"
+_TASK_ENTRY_TMPL = """
+## Task Entry - {timestamp}
+
+**Instruction:** {instruction}
+
+**Analysis:** {analysis}
+
+**Status:** Completed
+
+---
+"""
+
+def _count_files(path: str) -> int:
+    """Count regular files under path; scandir entries carry their type, so no stat per file"""
+    count = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False):
+                count += 1
+            elif entry.is_dir(follow_symlinks=False):
+                count += _count_files(entry.path)
+    return count
 
 class JugadAgent(BaseIntelligentAgent):
     """General purpose agent that follows instructions for various tasks"""
     
+    __slots__ = (
+        "project_path", "task_history", "logger",
+        "project_scan_ttl", "_project_scan_cache",
+        "_task_log", "_task_log_lock", "_file_writes", "_file_writer"
+    )
+    
     def __init__(self):
         super().__init__(
             agent_id="jugad-agent",
@@ -60,12 +194,26 @@ class JugadAgent(BaseIntelligentAgent):
         )
         
         # Project-specific settings
-        self.project_path = "/home/yamnik/Projects/jugad"
+        self.project_path = Path("/home/yamnik/Projects/jugad")
         self.current_task = None
-        self.task_history = []
+        self.task_history = deque(maxlen=50)  # last 50 tasks; older ones drop off on append
+        
+        # Project file scan is reused for this many seconds - pulses don't need it live
+        self.project_scan_ttl = 60
+        self._project_scan_cache = (0.0, None)  # (monotonic expiry, (file_count, has_readme, has_git))
         
         # Ensure project directory exists
-        Path(self.project_path).mkdir(parents=True, exist_ok=True)
+        if not self.project_path.exists():
+            self.project_path.mkdir(parents=True, exist_ok=True)
+        
+        # Completed tasks are appended to a JSONL log; workers share the handle under a lock
+        self._task_log = open(self.project_path / "task_log.jsonl", "ab")
+        self._task_log_lock = threading.Lock()
+        
+        # Analysis files are written by a background thread so replies don't wait on the disk
+        self._file_writes = queue.Queue()
+        self._file_writer = threading.Thread(target=self._file_writer_loop, name="jugad-file-writer", daemon=True)
+        self._file_writer.start()
         
         # Set up logging for this agent
         self.logger = logging.getLogger(f"jugad-agent")
@@ -75,17 +223,12 @@ class JugadAgent(BaseIntelligentAgent):
         """Get current project status"""
         try:
             # Check if project directory exists and has content
-            project_path = Path(self.project_path)
+            project_path = self.project_path
             if not project_path.exists():
                 return {"status": "not_found", "message": "Project directory not found"}
             
-            # Count files in project
-            files = list(project_path.rglob("*"))
-            file_count = len([f for f in files if f.is_file()])
-            
-            # Check for common project files
-            has_readme = (project_path / "README.md").exists()
-            has_git = (project_path / ".git").exists()
+            # Count files in project and check for common project files
+            file_count, has_readme, has_git = self._scan_project()
             
             return {
                 "status": "active",
@@ -102,16 +245,56 @@ class JugadAgent(BaseIntelligentAgent):
             self.logger.error(f"Error getting project status: {e}")
             return {"status": "error", "message": str(e)}
 
+    def _scan_project(self):
+        """File count plus README/.git presence, from one scandir walk reused for project_scan_ttl"""
+        expires, scan = self._project_scan_cache
+        now = time.monotonic()
+        if scan is None or now >= expires:
+            file_count = 0
+            has_readme = has_git = False
+            with os.scandir(self.project_path) as entries:
+                for entry in entries:
+                    if entry.name == "README.md":
+                        has_readme = True
+                    elif entry.name == ".git":
+                        has_git = True
+                    if entry.is_file(follow_symlinks=False):
+                        file_count += 1
+                    elif entry.is_dir(follow_symlinks=False):
+                        file_count += _count_files(entry.path)
+            scan = (file_count, has_readme, has_git)
+            self._project_scan_cache = (now + self.project_scan_ttl, scan)
+        return scan
+
+    def _fast_path_simple(self, message_data):
+        """Answer a mentioned arithmetic question directly; None means take the general path"""
+        message_text = message_data.get("message", "")
+        if not _JUGAD_MENTION_RE.search(message_text) or not _SIMPLE_QUESTION_RE.search(message_text):
+            return None
+        answer = self._answer_arithmetic(message_text)
+        if answer is None:
+            return None
+        
+        self.logger.info("🎯 Answered locally: %s", answer)
+        self.send_message("ai-manager", answer)
+        self._record_task(message_text, answer)
+        return True
+
     def process_message(self, message_data):
         """Process incoming messages and execute instructions"""
         try:
+            # Simple arithmetic skips activity updates and Claude entirely
+            result = self._fast_path_simple(message_data)
+            if result is not None:
+                return result
+            
             message_text = message_data.get("message", "")
             from_agent = message_data.get("from_agent", "unknown")
             
-            self.logger.info(f"📨 Received instruction from {from_agent}: {message_text}")
+            self.logger.info("📨 Received instruction from %s: %s", from_agent, message_text)
             
             # Only respond to @jugad mentions
-            if '@jugad' not in message_text.lower():
+            if not _JUGAD_MENTION_RE.search(message_text):
                 self.logger.info("Message not for me - IGNORING")
                 self.update_activity_status("idle", "Message not for me")
                 return False
@@ -128,7 +311,7 @@ class JugadAgent(BaseIntelligentAgent):
             
             response = self._ask_claude_for_instruction_understanding(message_text)
             if response:
-                self.logger.info(f"🧠 Claude response: {response}")
+                self.logger.info("🧠 Claude response: %s", response)
                 
                 # Execute the instruction
                 result = self._execute_instruction(response, message_text)
@@ -154,40 +337,34 @@ class JugadAgent(BaseIntelligentAgent):
     def _ask_claude_for_instruction_understanding(self, instruction: str) -> str:
         """Use Claude to understand what instruction is being given"""
         try:
+            # Repeated instructions are answered from the reply cache, keyed per model
+            model = self.get_current_model()
+            cached = self._get_cached_response(instruction, model)
+            if cached is not None:
+                self.logger.info("♻️ Reusing cached Claude response for repeated instruction")
+                return cached
+            
             # For simple questions, just pass them directly to Claude
             if self._is_simple_question(instruction):
                 response = self.claude_client.messages.create(
-                    model=self.get_current_model(),
+                    model=model,
                     max_tokens=200,
                     messages=[{"role": "user", "content": instruction}]
                 )
-                return response.content[0].text
-            
-            # For complex instructions, use the analysis prompt
-            prompt = f"""You are Jugad, a general purpose instruction-following agent.
-
-Instruction received: "{instruction}"
-
-Analyze this instruction and determine:
-1. What type of task is being requested?
-2. What specific actions should I take?
-3. What files or commands might be needed?
-
-Respond with a clear action plan. Examples:
-- "create_file: Create a new Python script for data processing"
-- "execute_command: Run git init to initialize the project"
-- "research: Research best practices for web development"
-- "setup_project: Set up a new React project structure"
-
-Be specific about what needs to be done."""
-
-            response = self.claude_client.messages.create(
-                model=self.get_current_model(),
-                max_tokens=200,
-                messages=[{"role": "user", "content": prompt}]
-            )
+                text = response.content[0].text
+            else:
+                # For complex instructions, use the analysis prompt
+                response = self.claude_client.messages.create(
+                    model=model,
+                    max_tokens=200,
+                    system=_INSTRUCTION_SYSTEM_BLOCK,
+                    messages=[{"role": "user", "content": f'Instruction received: "{instruction}"'}]
+                )
+                text = response.content[0].text.strip()
             
-            return response.content[0].text.strip()
+            if text:
+                self._cache_response(instruction, model, text)
+            return text
             
         except Exception as e:
             self.logger.error(f"❌ Claude instruction understanding failed: {e}")
@@ -196,32 +373,29 @@ Be specific about what needs to be done."""
     def _execute_instruction(self, claude_response: str, original_instruction: str) -> str:
         """Execute the instruction based on Claude's analysis"""
         try:
-            self.logger.info(f"🔧 Executing instruction: {claude_response}")
+            self.logger.info("🔧 Executing instruction: %s", claude_response)
             
             # Use Claude's response directly as the intelligent response
             # Instead of parsing keywords, let Claude's analysis be the response
-            self.logger.info(f"🧠 Using Claude's intelligent analysis as response")
+            self.logger.info("🧠 Using Claude's intelligent analysis as response")
             
             # Create a file with Claude's detailed analysis
-            filename = f"claude_analysis_{datetime.now().strftime('%H%M%S')}.md"
-            content = f"""# Claude Analysis - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-## Original Instruction:
-{original_instruction}
-
-## Claude's Intelligent Analysis:
-{claude_response}
-
-## Status:
-Task analyzed and processed by Jugad agent using Claude AI
-"""
+            # One clock read and format serves both the filename and the heading
+            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            # Four workers can finish within the same second, so add the sub-second nanoseconds
+            filename = f"claude_analysis_{timestamp[11:].replace(':', '')}_{time.time_ns() % 1_000_000_000:09d}.md"
+            content = _ANALYSIS_TMPL.format_map({
+                "timestamp": timestamp,
+                "instruction": original_instruction,
+                "analysis": claude_response
+            })
             
-            file_path = Path(self.project_path) / filename
-            file_path.write_text(content)
+            file_path = self.project_path / filename
+            self._file_writes.put((file_path, content))
             
             # For simple questions, return Claude's response directly
             if self._is_simple_question(original_instruction):
-                self.logger.info(f"🎯 Direct Claude response: {claude_response}")
+                self.logger.info("🎯 Direct Claude response: %s", claude_response)
                 return claude_response
             
             # Return Claude's analysis as the response
@@ -236,19 +410,13 @@ Task analyzed and processed by Jugad agent using Claude AI
         try:
             # For now, create a basic file based on instruction
             filename = "task_output.txt"
-            content = f"""# Task Output - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-## Original Instruction:
-{original_instruction}
-
-## Claude Analysis:
-{claude_response}
-
-## Status:
-Task completed by Jugad agent
-"""
+            content = _TASK_OUTPUT_TMPL.format_map({
+                "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                "instruction": original_instruction,
+                "analysis": claude_response
+            })
             
-            file_path = Path(self.project_path) / filename
+            file_path = self.project_path / filename
             file_path.write_text(content)
             
             return f"✅ Created file: {filename} in Jugad project"
@@ -260,12 +428,11 @@ Task completed by Jugad agent
         """Handle command execution tasks"""
         try:
             # Extract command from instruction if possible
-            if "git init" in original_instruction.lower():
-                result = self.execute_command("git init", cwd=self.project_path)
-                return f"✅ Executed: git init - {result}"
-            elif "npm init" in original_instruction.lower():
-                result = self.execute_command("npm init -y", cwd=self.project_path)
-                return f"✅ Executed: npm init - {result}"
+            match = _COMMAND_TRIGGER_RE.search(original_instruction)
+            if match:
+                trigger = match.group(0).lower()
+                result = self.execute_command(_COMMAND_TRIGGERS[trigger], cwd=self.project_path)
+                return f"✅ Executed: {trigger} - {result}"
             else:
                 return f"✅ Ready to execute command. Please specify the exact command to run."
                 
@@ -276,22 +443,11 @@ Task completed by Jugad agent
         """Handle project setup tasks"""
         try:
             # Create basic project structure
-            readme_path = Path(self.project_path) / "README.md"
-            readme_content = f"""# Jugad Project
-
-Created by Jugad Agent on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-## Purpose
-{original_instruction}
-
-## Status
-Project initialized and ready for development.
-
-## Next Steps
-- Add project-specific files
-- Set up development environment
-- Begin implementation
-"""
+            readme_path = self.project_path / "README.md"
+            readme_content = _PROJECT_README_TMPL.format_map({
+                "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                "instruction": original_instruction
+            })
             readme_path.write_text(readme_content)
             
             return f"✅ Project setup completed. Created README.md in Jugad project."
@@ -303,23 +459,12 @@ Project initialized and ready for development.
         """Handle research tasks"""
         try:
             # Create research output file
-            research_path = Path(self.project_path) / "research_output.md"
-            research_content = f"""# Research Output - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-## Research Topic
-{original_instruction}
-
-## Analysis
-{claude_response}
-
-## Findings
-Research completed by Jugad agent. Please review and provide more specific research requirements if needed.
-
-## Next Steps
-- Refine research scope
-- Gather specific information
-- Create implementation plan
-"""
+            research_path = self.project_path / "research_output.md"
+            research_content = _RESEARCH_TMPL.format_map({
+                "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                "instruction": original_instruction,
+                "analysis": claude_response
+            })
             research_path.write_text(research_content)
             
             return f"✅ Research task completed. Created research_output.md"
@@ -331,26 +476,19 @@ Research completed by Jugad agent. Please review and provide more specific resea
         """Handle general tasks"""
         try:
             # Create task output
-            task_path = Path(self.project_path) / "task_log.md"
+            task_path = self.project_path / "task_log.md"
             
-            # Append to existing log or create new
-            if task_path.exists():
-                content = task_path.read_text()
-            else:
-                content = "# Jugad Task Log\n\n"
+            # Append to the log instead of rewriting it; the header goes in once when it is created
+            is_new = not task_path.exists()
             
-            content += f"""
-## Task Entry - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-**Instruction:** {original_instruction}
-
-**Analysis:** {claude_response}
-
-**Status:** Completed
-
----
-"""
-            task_path.write_text(content)
+            entry = _TASK_ENTRY_TMPL.format_map({
+                "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                "instruction": original_instruction,
+                "analysis": claude_response
+            })
+            with open(task_path, "a") as f:
+                # Header and entry go out in one write
+                f.write(_TASK_LOG_HEADER + entry if is_new else entry)
             
             return f"✅ General task completed. Updated task_log.md"
             
@@ -367,73 +505,87 @@ Research completed by Jugad agent. Please review and provide more specific resea
         }
         self.task_history.append(task_record)
         
-        # Keep only last 50 tasks
-        if len(self.task_history) > 50:
-            self.task_history = self.task_history[-50:]
+        # Persist as one appended line rather than rewriting a log file
+        with self._task_log_lock:
+            if not self._task_log.closed:
+                self._task_log.write(_dumps(task_record) + b"\n")
+                self._task_log.flush()
+
+    def _file_writer_loop(self):
+        """Write queued (path, content) pairs until a None sentinel arrives"""
+        while True:
+            item = self._file_writes.get()
+            if item is None:
+                return
+            file_path, content = item
+            try:
+                file_path.write_text(content)
+            except OSError as e:
+                self.logger.error("❌ Failed to write %s: %s", file_path.name, e)
+
+    def close(self):
+        """Finish pending file writes and close the task log along with the base agent's connections"""
+        super().close()
+        self._file_writes.put(None)
+        self._file_writer.join(timeout=5)
+        with self._task_log_lock:
+            self._task_log.close()
 
     def _is_simple_question(self, instruction: str) -> bool:
         """Check if this is a simple question that needs a direct answer"""
-        simple_patterns = [
-            r"what is \d+\+\d+",
-            r"what is \d+\-\d+", 
-            r"what is \d+\*\d+",
-            r"what is \d+\/\d+",
-            r"calculate \d+\+\d+",
-            r"answer with only",
-            r"just tell me",
-            r"what is \d+",
-            r"how much is \d+"
-        ]
-        
-        instruction_lower = instruction.lower()
-        for pattern in simple_patterns:
-            if re.search(pattern, instruction_lower):
-                return True
-        return False
+        return _SIMPLE_QUESTION_RE.search(instruction) is not None
+    
+    def _answer_arithmetic(self, instruction: str):
+        """Compute a two-operand arithmetic question, or None if there is none to compute"""
+        match = _ARITHMETIC_RE.search(instruction)
+        if not match:
+            return None
+        left, op, right = match.groups()
+        # Integers stay exact; only decimals and division go through float
+        left = float(left) if '.' in left else int(left)
+        right = float(right) if '.' in right else int(right)
+        try:
+            result = _ARITHMETIC_OPS[op](left, right)
+        except ZeroDivisionError:
+            return None
+        if isinstance(result, float):
+            return str(int(result)) if result.is_integer() else f"{result:.10g}"
+        return str(result)
     
     def _extract_direct_answer(self, claude_response: str, original_instruction: str) -> str:
         """Extract the direct answer from Claude's response"""
         # Look for specific answer patterns first
-        answer_patterns = [
-            r"answer is (\d+)",
-            r"result is (\d+)", 
-            r"equals (\d+)",
-            r"= (\d+)",
-            r"the answer is (\d+)",
-            r"answer: (\d+)",
-            r"result: (\d+)",
-            r"the answer is simply: (\d+)",
-            r"answer is simply: (\d+)",
-            r"simply: (\d+)",
-            r"answer is (\d+)$"
-        ]
-        
-        for pattern in answer_patterns:
-            match = re.search(pattern, claude_response.lower())
+        response_lower = claude_response.lower()
+        for pattern in _ANSWER_RES:
+            match = pattern.search(response_lower)
             if match:
                 return match.group(1)
         
         # For math questions, look for the calculation result
         if "what is" in original_instruction.lower() and any(op in original_instruction for op in ["+", "-", "*", "×", "/"]):
-            # Try to find the result of the calculation
-            # Look for patterns like "8 + 12 = 20" or "20"
-            calculation_patterns = [
-                r"(\d+)\s*\+\s*(\d+)\s*=\s*(\d+)",
-                r"(\d+)\s*\-\s*(\d+)\s*=\s*(\d+)",
-                r"(\d+)\s*\*\s*(\d+)\s*=\s*(\d+)",
-                r"(\d+)\s*×\s*(\d+)\s*=\s*(\d+)",
-                r"(\d+)\s*/\s*(\d+)\s*=\s*(\d+)"
-            ]
-            
-            for pattern in calculation_patterns:
-                match = re.search(pattern, claude_response)
-                if match:
-                    return match.group(3)  # Return the result
+            # Look for patterns like "8 + 12 = 20"
+            match = _CALCULATION_RE.search(claude_response)
+            if match:
+                return match.group(3)  # Return the result
         
         # If no specific pattern found, return "Unable to extract answer"
         return "Unable to extract answer"
 
-    def run(self):
+    def _heartbeat_tick(self):
+        """Report project status with each heartbeat in a single state update"""
+        project_status = self.get_project_status()
+        if project_status['status'] == 'active':
+            self.send_state(
+                pulse_message=f"Jugad project monitoring: {project_status['status']}. Ready for instructions.",
+                pulse_status='online'
+            )
+        else:
+            self.send_state(
+                pulse_message=f"Jugad project status: {project_status['status']}",
+                pulse_status='warning'
+            )
+
+    def run(self, heartbeat_interval=30, message_check_interval=2):
         """Main agent loop"""
         self.logger.info("Jugad Agent starting...")
         
@@ -444,32 +596,20 @@ Research completed by Jugad agent. Please review and provide more specific resea
         
         self.logger.info("Jugad Agent registered successfully")
         
+        # Heartbeat plus project status pulse run on their own thread so they never gate messages
+        self.start_heartbeat(heartbeat_interval)
+        
         # Main loop
         while True:
             try:
-                # Send heartbeat
-                self.send_heartbeat()
-                
-                # Check for messages
+                # Starts the message stream on first call; polls only while the stream is down
                 self.check_for_messages()
                 
-                # Get project status and send pulse update
-                project_status = self.get_project_status()
-                if project_status['status'] == 'active':
-                    self.send_pulse_update(
-                        message=f"Jugad project monitoring: {project_status['status']}. Ready for instructions.",
-                        status='online'
-                    )
-                else:
-                    self.send_pulse_update(
-                        message=f"Jugad project status: {project_status['status']}",
-                        status='warning'
-                    )
-                
-                time.sleep(30)  # Check every 30 seconds
+                time.sleep(message_check_interval)
                 
             except KeyboardInterrupt:
                 self.logger.info("Jugad Agent shutting down...")
+                self.close()
                 break
             except Exception as e:
                 self.logger.error(f"Error in main loop: {e}")
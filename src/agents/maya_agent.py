@@ -5,22 +5,25 @@ Works with the actual Maya 3D Life Simulation Game project
 """
 
 import os
+import re
 import sys
 import time
-import json
-import requests
+import shlex
+import logging
+import subprocess
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any
-import sys
-import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.agents.base_intelligent_agent import BaseIntelligentAgent
+from src.agents.base_intelligent_agent import BaseIntelligentAgent, _count_proc_matching, _read_json, _read_text
 from src.utils.environment import setup_environment
 
 # FORCE API KEY LOADING - NO FALLBACK
 setup_environment()
 
+# Command lines of dev-server processes (matched against /proc/<pid>/cmdline)
+_DEV_PROCESS_RE = re.compile(rb'vite|npm|node.*maya')
+
 class MayaAgent(BaseIntelligentAgent):
     def __init__(self):
         super().__init__(
@@ -41,45 +44,83 @@ class MayaAgent(BaseIntelligentAgent):
         self.api_base = "http://localhost:5000/api"
         
         # Set up logger
-        import logging
         self.logger = logging.getLogger(f"maya-agent")
         
+        # Status and config results are reused while package.json / the config files are unchanged
+        self.project_status_ttl = 30
+        self._project_status_cache = (None, 0.0, None)  # (package.json mtime_ns, monotonic expiry, status)
+        self._project_config_cache = (None, None)  # (config file mtimes, config)
+        # Monotonic deadline until which the project root is known to be missing
+        self._project_root_missing_until = 0.0
+        # Dev server started by start_development_server, polled from run()
+        self._dev_server = None
+        
     def get_project_status(self):
-        """Get the current status of the Maya 3D project"""
+        """Get the current status of the Maya 3D project, reusing a recent result"""
+        entries = self._scan_project_root()
+        mtime = None
+        if entries and 'package.json' in entries:
+            try:
+                mtime = entries['package.json'].stat().st_mtime_ns
+            except OSError:
+                pass
+        cached_mtime, expires, status = self._project_status_cache
+        now = time.monotonic()
+        if status is None or mtime != cached_mtime or now >= expires:
+            status = self._collect_project_status(entries)
+            self._project_status_cache = (mtime, now + self.project_status_ttl, status)
+        return status
+    
+    def _scan_project_root(self):
+        """List the project root once as {name: DirEntry}; None when the directory is missing"""
+        if self._project_root_missing():
+            return None
         try:
-            if not self.project_path.exists():
+            with os.scandir(self.project_path) as it:
+                entries = {entry.name: entry for entry in it}
+        except (FileNotFoundError, NotADirectoryError):
+            self._project_root_missing_until = time.monotonic() + 30
+            return None
+        self._project_root_missing_until = 0.0
+        return entries
+    
+    def _project_root_missing(self) -> bool:
+        """Whether a recent scan found the project root missing"""
+        return time.monotonic() < self._project_root_missing_until
+    
+    def _collect_project_status(self, entries):
+        """Check the Maya 3D project on disk"""
+        try:
+            if entries is None:
                 return {"status": "project_not_found", "error": "Project directory not found"}
             
             # Check if package.json exists
-            package_json = self.project_path / "package.json"
-            if not package_json.exists():
+            if 'package.json' not in entries:
                 return {"status": "incomplete", "error": "package.json not found"}
+            package_json = self.project_path / "package.json"
             
             # Check if node_modules exists
-            node_modules = self.project_path / "node_modules"
-            dependencies_installed = node_modules.exists()
+            dependencies_installed = 'node_modules' in entries
             
             # Check git status
-            git_status = self._run_command("git status --porcelain", cwd=self.project_path)
+            git_status = self._run_command(["git", "status", "--porcelain"], cwd=self.project_path)
             
             # Check if there are any running dev servers
-            dev_processes = self._run_command("ps aux | grep -E 'vite|npm|node.*maya' | grep -v grep")
+            dev_processes = _count_proc_matching(_DEV_PROCESS_RE)
             
             # Check package.json for project info
-            package_info = {}
-            if package_json.exists():
-                try:
-                    package_info = json.loads(package_json.read_text())
-                except:
-                    package_info = {"error": "Could not parse package.json"}
+            try:
+                package_info = _read_json(package_json)
+            except:
+                package_info = {"error": "Could not parse package.json"}
             
             return {
                 "status": "active",
                 "project_path": str(self.project_path),
-                "package_json_exists": package_json.exists(),
+                "package_json_exists": True,
                 "dependencies_installed": dependencies_installed,
                 "git_status": git_status.strip() if git_status else "clean",
-                "dev_processes": len(dev_processes.strip().split('\n')) if dev_processes.strip() else 0,
+                "dev_processes": dev_processes,
                 "project_name": package_info.get("name", "unknown"),
                 "project_version": package_info.get("version", "unknown"),
                 "last_check": datetime.now().isoformat()
@@ -90,26 +131,41 @@ class MayaAgent(BaseIntelligentAgent):
     def get_project_config(self):
         """Get project configuration information"""
         try:
-            config_files = [
-                self.project_path / "package.json",
-                self.project_path / "tsconfig.json",
-                self.project_path / "vite.config.ts",
-                self.project_path / "README.md"
-            ]
+            entries = self._scan_project_root() or {}
+            config_names = ("package.json", "tsconfig.json", "vite.config.ts", "README.md")
+            present = [name for name in config_names if name in entries]
             
+            # Rebuild only when one of the config files changed, appeared or disappeared
+            mtimes = []
+            for name in present:
+                try:
+                    mtimes.append((name, entries[name].stat().st_mtime_ns))
+                except FileNotFoundError:
+                    pass
+            mtimes = tuple(mtimes)
+            cached_mtimes, config = self._project_config_cache
+            if config is not None and cached_mtimes == mtimes:
+                return config
+            
+            # Reads are memoized on mtime/size, so unchanged files cost a single stat
             config_data = {}
-            for config_file in config_files:
-                if config_file.exists():
+            for name, _ in mtimes:
+                config_file = self.project_path / name
+                try:
                     if config_file.suffix == '.json':
-                        config_data[config_file.name] = json.loads(config_file.read_text())
+                        config_data[name] = _read_json(config_file)
                     else:
-                        config_data[config_file.name] = config_file.read_text()
+                        config_data[name] = _read_text(config_file)
+                except FileNotFoundError:
+                    continue
             
-            return {
+            config = {
                 "config_files": list(config_data.keys()),
                 "config_data": config_data,
                 "project_ready": len(config_data) > 0
             }
+            self._project_config_cache = (mtimes, config)
+            return config
         except Exception as e:
             return {"error": str(e)}
     
@@ -127,10 +183,9 @@ class MayaAgent(BaseIntelligentAgent):
     
     def install_dependencies(self):
         """Install project dependencies using pnpm"""
+        if self._project_root_missing():
+            return {"success": False, "status": "project_not_found", "error": "Project directory not found"}
         try:
-            import subprocess
-            import os
-            
             # Change to project directory and run pnpm install
             result = subprocess.run(
                 ['pnpm', 'install'],
@@ -153,10 +208,9 @@ class MayaAgent(BaseIntelligentAgent):
     
     def start_development_server(self):
         """Start the development server using pnpm"""
+        if self._project_root_missing():
+            return {"success": False, "status": "project_not_found", "error": "Project directory not found"}
         try:
-            import subprocess
-            import os
-            
             # Check if dependencies are installed
             if not (self.project_path / "node_modules").exists():
                 self.logger.info("📦 Installing dependencies first...")
@@ -173,6 +227,7 @@ class MayaAgent(BaseIntelligentAgent):
                 text=True
             )
             
+            self._dev_server = process
             self.logger.info("🚀 Development server started with pnpm run dev")
             return {"success": True, "message": "Server started on http://localhost:5173", "process": process}
                 
@@ -251,9 +306,16 @@ Generate the complete component code."""
     
     def run_dev_server(self):
         """Check if dev server can be started"""
+        if self._project_root_missing():
+            return {
+                "can_run": False,
+                "status": "project_not_found",
+                "error": "Project directory not found",
+                "timestamp": datetime.now().isoformat()
+            }
         try:
             # Check if npm is available
-            npm_check = self._run_command("npm --version")
+            npm_check = self._run_command(["npm", "--version"])
             if "Error" in npm_check:
                 return {
                     "can_run": False,
@@ -264,7 +326,7 @@ Generate the complete component code."""
             # Check if vite is available in package.json
             package_json = self.project_path / "package.json"
             if package_json.exists():
-                package_data = json.loads(package_json.read_text())
+                package_data = _read_json(package_json)
                 scripts = package_data.get("scripts", {})
                 has_dev_script = "dev" in scripts
                 
@@ -288,18 +350,23 @@ Generate the complete component code."""
                 "timestamp": datetime.now().isoformat()
             }
     
-    def _run_command(self, command, cwd=None):
-        """Run a shell command and return output"""
-        import subprocess
+    def _run_command(self, command, cwd=None, timeout=3):
+        """Run a command directly (no shell) and return output"""
         try:
+            if isinstance(command, str):
+                command = shlex.split(command)
             result = subprocess.run(
                 command, 
-                shell=True, 
                 capture_output=True, 
                 text=True, 
-                cwd=cwd
+                cwd=cwd,
+                timeout=timeout
             )
             return result.stdout
+        except subprocess.TimeoutExpired:
+            # subprocess.run kills the child on expiry, so a hung git/npm can't stall the loop
+            self.logger.warning(f"⏱️ Command timed out after {timeout}s: {' '.join(command)}")
+            return f"Error: timed out after {timeout}s"
         except Exception as e:
             return f"Error: {e}"
     
@@ -442,6 +509,13 @@ Examples:
                 # Check for messages
                 self.check_for_messages()
                 
+                # Notice a dev server that exited without waiting for the next process scan
+                if self._dev_server is not None and self._dev_server.poll() is not None:
+                    self.logger.warning(f"⚠️ Development server exited with code {self._dev_server.returncode}")
+                    self._dev_server = None
+                    # Drop the cached status so dev_processes is recounted now
+                    self._project_status_cache = (None, 0.0, None)
+                
                 # Get project status and send pulse update
                 project_status = self.get_project_status()
                 if project_status['status'] == 'active':
@@ -8,12 +8,13 @@ import json
 import os
 import time
 import logging
+import threading
 import uuid
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
 # Web framework
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 
 # Claude API testing
@@ -69,6 +70,10 @@ class SimpleBackendAPIService:
         self.communication_log = []
         self._load_from_database()
         
+        # Wakes agent message streams when a new communication is logged
+        self.communication_condition = threading.Condition()
+        self.stream_keepalive_seconds = 15
+        
         # Cache for live model info to avoid excessive API calls
         self.model_info_cache = {}
         self.model_info_cache_timeout = 30  # seconds
@@ -229,6 +234,29 @@ class SimpleBackendAPIService:
         logger.info(f"Using newest available model: {sorted_models[0]['display_name']}")
         return sorted_models[0]
     
+    def _log_communication(self, agent_id: str, target_agent: Optional[str], message: str,
+                           defer: bool = False) -> Dict:
+        """Record a communication and wake any agent message streams"""
+        communication = {
+            "id": str(uuid.uuid4()),
+            "timestamp": datetime.now().isoformat(),
+            "from_agent": agent_id,
+            "to_agent": target_agent or "broadcast",
+            "message": message,
+            "type": "direct" if target_agent else "broadcast"
+        }
+        # Senders opt in to a slow, batched reply; nothing else is deferred
+        if defer:
+            communication["defer"] = True
+        
+        with self.communication_condition:
+            self.communication_log.append(communication)
+            self.communication_condition.notify_all()
+        self.system_stats["total_communications"] += 1
+        
+        logger.info(f"Communication from {agent_id} to {target_agent or 'broadcast'}: {message}")
+        return communication
+    
     def _load_from_database(self):
         """Load existing data from database"""
         if not self.db:
@@ -418,6 +446,30 @@ class SimpleBackendAPIService:
             else:
                 return jsonify({"error": "Agent not found"}), 404
         
+        @self.app.route('/api/agents/<agent_id>/state', methods=['POST'])
+        def agent_state(agent_id):
+            """Heartbeat, pulse and activity update combined in one request"""
+            self.system_stats["api_calls"] += 1
+            data = request.get_json() or {}
+            
+            if agent_id not in self.registered_agents:
+                return jsonify({"error": "Agent not found"}), 404
+            
+            now = datetime.now().isoformat()
+            agent = self.registered_agents[agent_id]
+            agent["last_seen"] = now
+            agent["status"] = "online"
+            
+            if data.get("activity_status"):
+                agent["activity_status"] = data["activity_status"]
+                agent["activity_details"] = data.get("activity_details", "")
+                agent["last_activity"] = now
+            
+            if data.get("pulse_message"):
+                logger.info(f"Pulse update from {agent_id}: {data['pulse_message']}")
+            
+            return jsonify({"status": "state_received"})
+        
         @self.app.route('/api/agents/<agent_id>/send', methods=['POST'])
         def send_message(agent_id):
             """Send a message from one agent to another"""
@@ -495,22 +547,36 @@ class SimpleBackendAPIService:
             if target_agent and agent_id == target_agent:
                 return jsonify({"error": "Agents cannot send messages to themselves"}), 400
             
-            # Create communication entry
-            communication = {
-                "id": str(uuid.uuid4()),
-                "timestamp": datetime.now().isoformat(),
-                "from_agent": agent_id,
-                "to_agent": target_agent or "broadcast",
-                "message": message,
-                "type": "direct" if target_agent else "broadcast"
-            }
+            communication = self._log_communication(agent_id, target_agent, message, data.get('defer') is True)
             
-            self.communication_log.append(communication)
-            self.system_stats["total_communications"] += 1
+            return jsonify({"status": "message_sent", "communication_id": communication["id"]})
+        
+        @self.app.route('/api/communications/send_batch', methods=['POST'])
+        def send_communication_batch():
+            """Send several communication messages from one agent in a single request"""
+            self.system_stats["api_calls"] += 1
+            data = request.get_json()
+            
+            agent_id = data.get('agent_id')
+            messages = data.get('messages')
             
-            logger.info(f"Communication from {agent_id} to {target_agent or 'broadcast'}: {message}")
+            if not agent_id or not isinstance(messages, list):
+                return jsonify({"error": "agent_id and messages required"}), 400
             
-            return jsonify({"status": "message_sent", "communication_id": communication["id"]})
+            results = []
+            for entry in messages:
+                message = entry.get('message')
+                target_agent = entry.get('target_agent')
+                
+                if not message:
+                    results.append({"error": "message required"})
+                elif target_agent and agent_id == target_agent:
+                    results.append({"error": "Agents cannot send messages to themselves"})
+                else:
+                    communication = self._log_communication(agent_id, target_agent, message, entry.get('defer') is True)
+                    results.append({"communication_id": communication["id"]})
+            
+            return jsonify({"status": "messages_sent", "results": results})
         
         @self.app.route('/api/communications', methods=['GET'])
         def get_communications():
@@ -523,19 +589,62 @@ class SimpleBackendAPIService:
         
         @self.app.route('/api/agents/<agent_id>/messages', methods=['GET'])
         def get_agent_messages(agent_id):
-            """Get messages for a specific agent"""
+            """Get messages for a specific agent, optionally only those after a given message id"""
             self.system_stats["api_calls"] += 1
+            since = request.args.get('since')
             
-            # Filter messages for this agent
-            agent_messages = []
-            for comm in self.communication_log:
+            # Walk back from the newest message, stopping at the caller's last seen id
+            recent_messages = []
+            for comm in reversed(self.communication_log):
+                if since and comm.get('id') == since:
+                    break
                 if comm.get('to_agent') == agent_id or comm.get('to_agent') == 'broadcast':
-                    agent_messages.append(comm)
+                    recent_messages.append(comm)
+                    # Return at most the last 20 messages for this agent
+                    if len(recent_messages) == 20:
+                        break
             
-            # Return last 20 messages for this agent
-            recent_messages = agent_messages[-20:] if len(agent_messages) > 20 else agent_messages
+            recent_messages.reverse()
             return jsonify(recent_messages)
         
+        @self.app.route('/api/agents/<agent_id>/stream', methods=['GET'])
+        def stream_agent_messages(agent_id):
+            """Stream new messages for a specific agent as Server-Sent Events"""
+            self.system_stats["api_calls"] += 1
+            # Resume after the caller's last seen message so nothing logged between polls is lost
+            since = request.args.get('since') or request.headers.get('Last-Event-ID')
+            
+            def generate():
+                with self.communication_condition:
+                    cursor = len(self.communication_log)
+                    if since:
+                        for index in range(cursor - 1, -1, -1):
+                            if self.communication_log[index].get('id') == since:
+                                cursor = index + 1
+                                break
+                # Flush headers straight away so the client knows it is connected
+                yield ": connected\n\n"
+                while True:
+                    with self.communication_condition:
+                        if cursor >= len(self.communication_log):
+                            self.communication_condition.wait(timeout=self.stream_keepalive_seconds)
+                        # The log may have been cleared while we waited
+                        cursor = min(cursor, len(self.communication_log))
+                        new_messages = self.communication_log[cursor:]
+                        cursor += len(new_messages)
+                    
+                    sent = False
+                    for comm in new_messages:
+                        if comm.get('to_agent') == agent_id or comm.get('to_agent') == 'broadcast':
+                            yield f"id: {comm['id']}\ndata: {json.dumps(comm)}\n\n"
+                            sent = True
+                    if not sent:
+                        # Comment line keeps idle connections from timing out
+                        yield ": keepalive\n\n"
+            
+            return Response(generate(), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache'})
+        
         @self.app.route('/api/agents/<agent_id>/status', methods=['PUT'])
         def update_agent_status(agent_id):
             """Update agent status"""
@@ -625,7 +734,6 @@ class SimpleBackendAPIService:
         logger.info(f"Health check: http://localhost:{port}/health")
         
         # Start cleanup thread
-        import threading
         def cleanup_thread():
             while True:
                 time.sleep(10)  # Check every 10 seconds